@@ -3,8 +3,12 @@
 # Command-line interface for WSC decompiler
 
 import argparse
+import multiprocessing
 import os
 import sys
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from decompiler import decompile_wsc_file
 
@@ -20,12 +24,15 @@ Examples:
   %(prog)s input.wsc -o output.txt      # Specify output file
   %(prog)s input.wsc -d output_dir/     # Output to directory
   %(prog)s *.wsc -d output_dir/         # Batch decompile all .wsc files
+  %(prog)s *.wsc -d output_dir/ -j 4    # Batch decompile with 4 worker processes
         """
     )
 
     parser.add_argument('input', nargs='+', help='Input .WSC file(s)')
     parser.add_argument('-o', '--output', help='Output file (for single input file)')
     parser.add_argument('-d', '--dir', help='Output directory (default: current directory)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes for batch mode (default: CPU count)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--version', action='version', version='WSC Decompiler 1.0')
 
@@ -50,10 +57,8 @@ Examples:
     else:
         output_dir = Path.cwd()
 
-    # Process files
-    success_count = 0
-    error_count = 0
-
+    # Build job list
+    jobs = []
     for input_file in args.input:
         input_path = Path(input_file)
 
@@ -63,25 +68,64 @@ Examples:
         else:
             output_file = output_dir / f"{input_path.stem}.txt"
 
-        try:
-            if args.verbose:
-                print(f"Processing: {input_file}")
-                print(f"  Output: {output_file}")
+        jobs.append((input_file, output_file))
 
-            decompile_wsc_file(str(input_path), str(output_file))
-            success_count += 1
+    # Process files
+    success_count = 0
+    error_count = 0
 
+    def report(input_file, output_file, error=None):
+        nonlocal success_count, error_count
+        if error is None:
+            success_count += 1
             if args.verbose:
+                print(f"Processing: {input_file}")
+                print(f"  Output: {output_file}")
                 print(f"  ✓ Success")
             else:
                 print(f"{input_file} -> {output_file}")
-
-        except Exception as e:
+        else:
             error_count += 1
-            print(f"Error processing {input_file}: {e}", file=sys.stderr)
+            print(f"Error processing {input_file}: {error}", file=sys.stderr)
             if args.verbose:
-                import traceback
-                traceback.print_exc()
+                traceback.print_exception(type(error), error, error.__traceback__)
+
+    serial_jobs = jobs
+    if len(jobs) > 1 and args.jobs > 1:
+        # Inputs that map to the same output (a/x.wsc and b/x.wsc) would race
+        # in the pool; they run one at a time afterwards, in input order, so
+        # the last one wins exactly as in a serial run
+        output_counts = Counter(os.path.normcase(os.path.abspath(output_file))
+                                for _, output_file in jobs)
+        parallel_jobs = []
+        serial_jobs = []
+        for job in jobs:
+            if output_counts[os.path.normcase(os.path.abspath(job[1]))] > 1:
+                serial_jobs.append(job)
+            else:
+                parallel_jobs.append(job)
+        if serial_jobs:
+            print(f"Warning: {len(serial_jobs)} inputs share output files; "
+                  f"processing them one at a time", file=sys.stderr)
+
+        if parallel_jobs:
+            # Files are independent and CPU-bound, so fan out across processes
+            with ProcessPoolExecutor(max_workers=min(args.jobs, len(parallel_jobs))) as executor:
+                futures = {
+                    executor.submit(decompile_wsc_file, str(input_file), str(output_file)): (input_file, output_file)
+                    for input_file, output_file in parallel_jobs
+                }
+                for future in as_completed(futures):
+                    input_file, output_file = futures[future]
+                    report(input_file, output_file, future.exception())
+
+    for input_file, output_file in serial_jobs:
+        try:
+            decompile_wsc_file(str(input_file), str(output_file))
+        except Exception as e:
+            report(input_file, output_file, e)
+        else:
+            report(input_file, output_file)
 
     # Summary
     total_files = len(args.input)
@@ -94,4 +138,5 @@ Examples:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Worker processes in PyInstaller builds
     sys.exit(main())
\ No newline at end of file
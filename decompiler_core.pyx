@@ -0,0 +1,39 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# decompiler_core.pyx
+# Optional compiled core for decompiler.extract_all_null_strings.
+# Build in place with:  cythonize -i decompiler_core.pyx
+# decompiler.py falls back to its pure-Python scan when this is not built.
+
+from libc.string cimport memchr
+
+
+def extract_all_null_strings(data, decode_fallback):
+    """Return list of (start, end, raw, decoded, is_speaker).
+
+    Walks NUL terminators with memchr and decodes each span with a cp932
+    fast path; spans cp932 rejects go through decode_fallback(raw).
+    """
+    cdef const unsigned char[::1] view = data
+    cdef Py_ssize_t n = view.shape[0]
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t end
+    cdef const unsigned char *buf
+    cdef const void *hit
+    out = []
+
+    if n == 0:
+        return out
+    buf = &view[0]
+
+    while pos < n:
+        hit = memchr(buf + pos, 0, n - pos)
+        end = n if hit == NULL else <const unsigned char *>hit - buf
+        if end > pos:
+            raw = data[pos:end]
+            try:
+                decoded = raw.decode("cp932")
+            except UnicodeDecodeError:
+                decoded = decode_fallback(raw)[0]
+            out.append((pos, end, raw, decoded, buf[pos] == 0x0F))
+        pos = end + 1
+    return out
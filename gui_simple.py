@@ -6,12 +6,35 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import json
+import multiprocessing
+import queue
 import sys
-from pathlib import Path
-from decompiler import decompile_wsc_file
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _iter_wsc(dir_path):
+    """Return the .wsc files directly inside dir_path, sorted by name."""
+    # scandir entries carry cached file-type info, so no extra stat per entry
+    with os.scandir(dir_path) as it:
+        return sorted(e.path for e in it if e.is_file() and e.name.lower().endswith('.wsc'))
 
 
 class WSCDecompilerGUI(tk.Tk):
+    # Log lines are batched into one Text insert per flush
+    LOG_FLUSH_LINES = 32
+    LOG_FLUSH_INTERVAL = 0.1  # seconds
+
+    # Rolling log scrollback; trimmed in chunks of LOG_TRIM_SLACK lines
+    MAX_LOG_LINES = 5000
+    LOG_TRIM_SLACK = 500
+
+    # How often (and how many) worker messages are applied to the UI
+    RESULT_POLL_MS = 30
+    RESULT_BATCH = 50
+
     def __init__(self):
         super().__init__()
 
@@ -25,9 +48,22 @@ class WSCDecompilerGUI(tk.Tk):
             "output_dir": "",
             "last_input_dir": ""
         }
+        self._settings_mtime = None  # mtime of settings.json last read/written
+        self._last_saved = None  # settings as last loaded from/saved to disk
 
-        # File lists
+        # File lists (the set mirrors wsc_files for O(1) duplicate checks)
         self.wsc_files = []
+        self._wsc_set = set()
+
+        # Log batching state (see log/flush_log)
+        self._log_buf = []
+        self._last_flush = 0.0
+        self._flush_pending = False
+
+        # Decompilation worker state (see start_decompilation/_drain_results)
+        self._worker = None
+        self._executor = None
+        self._result_q = queue.Queue()
 
         # Setup GUI
         self.setup_menu()
@@ -47,6 +83,7 @@ class WSCDecompilerGUI(tk.Tk):
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Open Single WSC...", command=self.open_single_file)
         file_menu.add_command(label="Open Multiple WSC...", command=self.open_multiple_files)
+        file_menu.add_command(label="Open Folder...", command=self.open_folder)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
 
@@ -91,6 +128,7 @@ class WSCDecompilerGUI(tk.Tk):
 
         ttk.Button(file_btn_frame, text="Add Single", command=self.open_single_file).pack(side="left", padx=(0, 5))
         ttk.Button(file_btn_frame, text="Add Multiple", command=self.open_multiple_files).pack(side="left", padx=(0, 5))
+        ttk.Button(file_btn_frame, text="Add Folder", command=self.open_folder).pack(side="left", padx=(0, 5))
         ttk.Button(file_btn_frame, text="Clear Files", command=self.clear_files).pack(side="left", padx=(0, 5))
         ttk.Button(file_btn_frame, text="Remove Selected", command=self.remove_selected_file).pack(side="left")
 
@@ -136,18 +174,39 @@ class WSCDecompilerGUI(tk.Tk):
         self.log_text.grid(row=0, column=0, sticky="nsew")
 
     def log(self, message, error=False):
-        """Add message to log."""
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.update()
+        """Add message to log (buffered, see flush_log)."""
+        self._log_buf.append(message)
         if error:
             self.status_var.set(f"Error: {message}")
         else:
             self.status_var.set(message)
 
+        if (len(self._log_buf) >= self.LOG_FLUSH_LINES or
+                time.monotonic() - self._last_flush > self.LOG_FLUSH_INTERVAL):
+            self.flush_log()
+        elif not self._flush_pending:
+            # Make sure a trailing partial batch still shows up
+            self._flush_pending = True
+            self.after(int(self.LOG_FLUSH_INTERVAL * 1000), self.flush_log)
+
+    def flush_log(self):
+        """Write buffered log lines to the log widget in a single insert."""
+        self._flush_pending = False
+        if self._log_buf:
+            self.log_text.insert(tk.END, "\n".join(self._log_buf) + "\n")
+            self._log_buf.clear()
+
+            # Bound the Text widget; the slack keeps this from deleting per flush
+            lines = int(self.log_text.index("end-1c").split(".")[0])
+            if lines > self.MAX_LOG_LINES + self.LOG_TRIM_SLACK:
+                self.log_text.delete("1.0", f"{lines - self.MAX_LOG_LINES}.0")
+
+            self.log_text.see(tk.END)
+        self._last_flush = time.monotonic()
+
     def open_single_file(self):
         """Open single WSC file."""
-        initial_dir = self.settings.get("last_input_dir", "")
+        initial_dir = self._get_settings().get("last_input_dir", "")
         file_path = filedialog.askopenfilename(
             title="Select WSC file",
             initialdir=initial_dir,
@@ -155,11 +214,11 @@ class WSCDecompilerGUI(tk.Tk):
         )
         if file_path:
             self.settings["last_input_dir"] = os.path.dirname(file_path)
-            self.add_file(file_path)
+            self._add_files_bulk([file_path])
 
     def open_multiple_files(self):
         """Open multiple WSC files."""
-        initial_dir = self.settings.get("last_input_dir", "")
+        initial_dir = self._get_settings().get("last_input_dir", "")
         file_paths = filedialog.askopenfilenames(
             title="Select WSC files",
             initialdir=initial_dir,
@@ -167,19 +226,55 @@ class WSCDecompilerGUI(tk.Tk):
         )
         if file_paths:
             self.settings["last_input_dir"] = os.path.dirname(file_paths[0])
-            for file_path in file_paths:
-                self.add_file(file_path)
+            self._add_files_bulk(file_paths)
+
+    def open_folder(self):
+        """Add every WSC file in a folder."""
+        initial_dir = self._get_settings().get("last_input_dir", "")
+        dir_path = filedialog.askdirectory(title="Select folder with WSC files", initialdir=initial_dir)
+        if dir_path:
+            self.settings["last_input_dir"] = dir_path
+            try:
+                file_paths = _iter_wsc(dir_path)
+            except OSError as e:
+                self.log(f"Could not read folder: {e}", error=True)
+                return
+            if not file_paths:
+                self.log(f"No WSC files found in: {dir_path}")
+                return
+            self._add_files_bulk(file_paths)
 
     def add_file(self, file_path):
         """Add file to list."""
-        if file_path not in self.wsc_files:
-            self.wsc_files.append(file_path)
-            self.files_listbox.insert(tk.END, os.path.basename(file_path))
-            self.log(f"Added: {os.path.basename(file_path)}")
+        self._add_files_bulk([file_path])
+
+    def _add_files_bulk(self, file_paths):
+        """Add files to list with a single listbox insert and one log line."""
+        new_paths = []
+        for file_path in file_paths:
+            if file_path not in self._wsc_set:
+                self._wsc_set.add(file_path)
+                new_paths.append(file_path)
+
+        if not new_paths:
+            return
+
+        self.wsc_files.extend(new_paths)
+        # One insert for the whole batch; existing rows are never re-inserted.
+        # tk.Listbox stores items as a single Tcl list in C, so this stays
+        # cheap for thousands of files without a virtualized view.
+        names = [os.path.basename(p) for p in new_paths]
+        self.files_listbox.insert(tk.END, *names)
+
+        if len(names) == 1:
+            self.log(f"Added: {names[0]}")
+        else:
+            self.log(f"Added {len(names)} files")
 
     def clear_files(self):
         """Clear all files."""
         self.wsc_files.clear()
+        self._wsc_set.clear()
         self.files_listbox.delete(0, tk.END)
         self.log("Cleared all files")
 
@@ -188,6 +283,7 @@ class WSCDecompilerGUI(tk.Tk):
         selection = self.files_listbox.curselection()
         if selection:
             index = selection[0]
+            self._wsc_set.discard(self.wsc_files[index])
             del self.wsc_files[index]
             self.files_listbox.delete(index)
             self.log("Removed selected file")
@@ -196,7 +292,7 @@ class WSCDecompilerGUI(tk.Tk):
         """Browse for output directory."""
         dir_path = filedialog.askdirectory(
             title="Select output directory",
-            initialdir=self.output_var.get() or self.settings.get("output_dir", "")
+            initialdir=self.output_var.get() or self._get_settings().get("output_dir", "")
         )
         if dir_path:
             self.output_var.set(dir_path)
@@ -220,26 +316,109 @@ class WSCDecompilerGUI(tk.Tk):
                 messagebox.showerror("Error", f"Could not create output directory: {e}")
                 return
 
-        # Process files
-        self.log(f"Starting decompilation of {len(self.wsc_files)} files...")
+        # Decompile on a background thread; it reports back through _result_q
+        snapshot = list(self.wsc_files)
+        self.log(f"Starting decompilation of {len(snapshot)} files...")
+        self.start_button.config(state="disabled")
+        self._worker = threading.Thread(target=self._worker_run, args=(snapshot, output_dir), daemon=True)
+        self._worker.start()
+        self.after(self.RESULT_POLL_MS, self._drain_results)
+
+    def _worker_run(self, wsc_files, output_dir):
+        """Decompile files off the Tk thread. Never touches widgets directly."""
+        # Imported on first use so the window appears without loading the
+        # decompiler stack (codecs, regexes, optional NumPy)
+        from decompiler import decompile_wsc_file
+
+        post = self._result_q.put
         success_count = 0
         error_count = 0
 
-        for wsc_file in self.wsc_files:
+        # Local aliases: one LOAD_FAST per use instead of global + attribute lookups
+        basename = os.path.basename
+        splitext = os.path.splitext
+        join = os.path.join
+
+        jobs = []
+        add_job = jobs.append
+        for wsc_file in wsc_files:
+            # Parse the path once; the names ride along with the result
+            file_name = basename(wsc_file)
+            output_name = splitext(file_name)[0] + ".txt"
+            add_job((wsc_file, file_name, output_name, join(output_dir, output_name)))
+
+        # Always report "done", or the Start button stays disabled and
+        # _drain_results keeps polling forever
+        try:
+            if len(jobs) > 1:
+                # Files are independent and CPU-bound, so fan out across processes
+                with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+                    self._executor = executor
+                    futures = {}
+                    for index, (wsc_file, file_name, output_name, output_file) in enumerate(jobs):
+                        post(("log", f"Processing: {file_name}", False))
+                        try:
+                            future = executor.submit(decompile_wsc_file, wsc_file, output_file)
+                        except BrokenProcessPool as e:
+                            # A worker died (e.g. killed for memory); the pool
+                            # takes no more jobs, so the rest count as failed
+                            skipped = len(jobs) - index
+                            post(("log", f"Worker pool stopped, {skipped} file(s) not processed: {e}", True))
+                            error_count += skipped
+                            break
+                        futures[future] = (file_name, output_name)
+
+                    for future in as_completed(futures):
+                        if future.cancelled():
+                            continue
+                        file_name, output_name = futures[future]
+                        error = future.exception()
+                        if error is None:
+                            post(("log", f"  {file_name} -> {output_name}", False))
+                            success_count += 1
+                        else:
+                            post(("log", f"Error processing {file_name}: {error}", True))
+                            error_count += 1
+            else:
+                # A single file is not worth spinning up worker processes
+                for wsc_file, file_name, output_name, output_file in jobs:
+                    post(("log", f"Processing: {file_name}", False))
+                    try:
+                        decompile_wsc_file(wsc_file, output_file)
+                        post(("log", f"  {file_name} -> {output_name}", False))
+                        success_count += 1
+                    except Exception as e:
+                        post(("log", f"Error processing {file_name}: {e}", True))
+                        error_count += 1
+        except Exception as e:
+            post(("log", f"Decompilation stopped: {e}", True))
+        finally:
+            self._executor = None
+            post(("done", success_count, error_count))
+
+    def _drain_results(self):
+        """Apply queued worker messages to the UI, a bounded batch per tick."""
+        for _ in range(self.RESULT_BATCH):
             try:
-                base_name = os.path.splitext(os.path.basename(wsc_file))[0]
-                output_file = os.path.join(output_dir, f"{base_name}.txt")
+                kind, *payload = self._result_q.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "log":
+                message, error = payload
+                self.log(message, error=error)
+            else:  # "done"
+                self._finish_decompilation(*payload)
+                return
 
-                self.log(f"Processing: {os.path.basename(wsc_file)}")
-                decompile_wsc_file(wsc_file, output_file)
-                self.log(f"  -> {os.path.basename(output_file)}")
-                success_count += 1
-
-            except Exception as e:
-                self.log(f"Error processing {os.path.basename(wsc_file)}: {e}", error=True)
-                error_count += 1
+        self.after(self.RESULT_POLL_MS, self._drain_results)
 
+    def _finish_decompilation(self, success_count, error_count):
+        """Report the outcome of a finished decompilation run."""
+        self._worker = None
+        self.start_button.config(state="normal")
         self.log(f"Decompilation complete: {success_count} success, {error_count} errors")
+        self.flush_log()
 
         if error_count == 0:
             messagebox.showinfo("Success", f"Successfully decompiled {success_count} files!")
@@ -249,6 +428,7 @@ class WSCDecompilerGUI(tk.Tk):
 
     def clear_log(self):
         """Clear the log."""
+        self._log_buf.clear()
         self.log_text.delete(1.0, tk.END)
         self.status_var.set("Ready")
 
@@ -259,6 +439,8 @@ class WSCDecompilerGUI(tk.Tk):
                 with open(self.settings_file, 'r', encoding='utf-8') as f:
                     loaded_settings = json.load(f)
                     self.settings.update(loaded_settings)
+                self._settings_mtime = os.stat(self.settings_file).st_mtime
+                self._last_saved = dict(self.settings)
 
                 # Apply settings
                 if self.settings.get("output_dir"):
@@ -269,17 +451,46 @@ class WSCDecompilerGUI(tk.Tk):
             self.log(f"Could not load settings: {e}", error=True)
 
     def save_settings(self):
-        """Save settings to file."""
+        """Save settings to file (only when changed, via an atomic replace)."""
         try:
             self.settings["output_dir"] = self.output_var.get()
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2)
+            if self.settings == self._last_saved:
+                return  # Nothing changed since the last load/save
+
+            # Write a temp file and swap it in so a crash never leaves a
+            # truncated settings.json behind
+            tmp_path = self.settings_file + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, separators=(',', ':'))
+            os.replace(tmp_path, self.settings_file)
+
+            self._last_saved = dict(self.settings)
+            self._settings_mtime = os.stat(self.settings_file).st_mtime
         except Exception as e:
             self.log(f"Could not save settings: {e}", error=True)
 
+    def _get_settings(self):
+        """Return settings, re-reading settings.json only if it changed on disk."""
+        try:
+            mtime = os.stat(self.settings_file).st_mtime
+        except OSError:
+            return self.settings
+
+        if mtime != self._settings_mtime:
+            try:
+                with open(self.settings_file, 'r', encoding='utf-8') as f:
+                    self.settings.update(json.load(f))
+                self._settings_mtime = mtime
+            except (OSError, ValueError):
+                pass  # Keep the in-memory settings if the file is unreadable
+
+        return self.settings
+
     def on_closing(self):
         """Handle window closing."""
         self.save_settings()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
         self.destroy()
 
     def show_about(self):
@@ -311,4 +522,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Worker processes in PyInstaller builds
     main()
\ No newline at end of file
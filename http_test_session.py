@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# http_test_session.py
+# Shared requests.Session setup for the HTTP test scripts
+
+import requests
+from urllib3.util.retry import Retry
+
+
+def make_session():
+    """Return a pooled keep-alive session that retries transient gateway errors.
+
+    Only GET is retried: POSTs such as /api/recompile/compile write files,
+    and a retry could write the output twice.
+    """
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.05, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset(["GET"]))
+    session.mount("http://", requests.adapters.HTTPAdapter(
+        max_retries=retry, pool_connections=2, pool_maxsize=4))
+    return session
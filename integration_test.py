@@ -4,9 +4,6 @@
 
 import requests
 import json
-import tempfile
-import os
-from pathlib import Path
 
 def test_web_server_integration():
     """Test integration with the web server."""
@@ -15,16 +12,20 @@ def test_web_server_integration():
 
     base_url = "http://localhost:8082"
 
+    # One pooled keep-alive connection for every request below
+    session = requests.Session()
+    session.headers.update({'Connection': 'keep-alive'})
+
     try:
         # Test 1: Check if server is running
         print("1️⃣ Testing server connectivity...")
-        response = requests.get(base_url, timeout=5)
+        response = session.get(base_url, timeout=5)
         assert response.status_code == 200, "Server should respond with 200"
         print("✅ Server is running")
 
         # Test 2: Test directory browsing API
         print("2️⃣ Testing directory browsing API...")
-        response = requests.get(f"{base_url}/api/browse?path=/tmp", timeout=5)
+        response = session.get(f"{base_url}/api/browse?path=/tmp", timeout=5)
         assert response.status_code == 200, "Directory browsing should work"
         data = response.json()
         assert data.get('success'), "Directory API should return success"
@@ -50,78 +51,63 @@ SE_104.ogg
 %K%P
 """
 
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
-            f.write(sample_text)
-            temp_file_path = f.name
-
-        try:
-            # Upload file
-            with open(temp_file_path, 'rb') as f:
-                files = {'file': ('test.txt', f, 'text/plain')}
-                response = requests.post(f"{base_url}/api/recompile/upload", files=files, timeout=10)
-
-            assert response.status_code == 200, "Upload should succeed"
-            data = response.json()
-            assert data.get('success'), "Upload should return success"
-            assert len(data.get('entries', [])) > 0, "Should parse entries"
-
-            print(f"✅ Recompiler upload working - parsed {len(data['entries'])} entries")
-
-            # Test 4: Test validation API
-            print("4️⃣ Testing validation API...")
-
-            validation_data = {
-                'content': sample_text,
-                'entries': data['entries']
-            }
-
-            response = requests.post(
-                f"{base_url}/api/recompile/validate",
-                json=validation_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-
-            assert response.status_code == 200, "Validation should succeed"
-            validation_result = response.json()
-            assert validation_result.get('success'), "Validation should return success"
-
-            print("✅ Validation API working")
-
-            # Test 5: Test compilation API
-            print("5️⃣ Testing compilation API...")
-
-            compile_data = {
-                'entries': data['entries'],
-                'preserve_offsets': False,
-                'filename': 'test_output.wsc'
-            }
-
-            response = requests.post(
-                f"{base_url}/api/recompile/compile",
-                json=compile_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-
-            assert response.status_code == 200, "Compilation should succeed"
-            compile_result = response.json()
-            assert compile_result.get('success'), "Compilation should return success"
-            assert compile_result.get('file_size', 0) > 0, "Should create file with content"
-
-            print(f"✅ Compilation API working - created {compile_result['file_size']} byte file")
-
-        finally:
-            # Cleanup
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
+        # Upload the sample straight from memory - no temp file round-trip
+        payload = sample_text.encode('utf-8')
+        files = {'file': ('test.txt', payload, 'text/plain')}
+        response = session.post(f"{base_url}/api/recompile/upload", files=files, timeout=10)
+
+        assert response.status_code == 200, "Upload should succeed"
+        data = response.json()
+        assert data.get('success'), "Upload should return success"
+        assert len(data.get('entries', [])) > 0, "Should parse entries"
+
+        print(f"✅ Recompiler upload working - parsed {len(data['entries'])} entries")
+
+        # Test 4: Test validation API
+        print("4️⃣ Testing validation API...")
+
+        validation_data = {
+            'content': sample_text,
+            'entries': data['entries']
+        }
+
+        response = session.post(
+            f"{base_url}/api/recompile/validate",
+            json=validation_data,
+            timeout=10
+        )
+
+        assert response.status_code == 200, "Validation should succeed"
+        validation_result = response.json()
+        assert validation_result.get('success'), "Validation should return success"
+
+        print("✅ Validation API working")
+
+        # Test 5: Test compilation API
+        print("5️⃣ Testing compilation API...")
+
+        compile_data = {
+            'entries': data['entries'],
+            'preserve_offsets': False,
+            'filename': 'test_output.wsc'
+        }
+
+        response = session.post(
+            f"{base_url}/api/recompile/compile",
+            json=compile_data,
+            timeout=10
+        )
+
+        assert response.status_code == 200, "Compilation should succeed"
+        compile_result = response.json()
+        assert compile_result.get('success'), "Compilation should return success"
+        assert compile_result.get('file_size', 0) > 0, "Should create file with content"
+
+        print(f"✅ Compilation API working - created {compile_result['file_size']} byte file")
 
         # Test 6: Test recompiler page loads
         print("6️⃣ Testing recompiler interface...")
-        response = requests.get(base_url, timeout=5)
+        response = session.get(base_url, timeout=5)
         html_content = response.text
         assert "Recompiler" in html_content, "Recompiler should be in the page"
         assert "✏️ Recompiler" in html_content, "Recompiler tab should be present"
@@ -148,6 +134,8 @@ SE_104.ogg
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":
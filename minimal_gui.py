@@ -3,21 +3,9 @@
 # Minimal web GUI to test tab switching functionality
 
 import http.server
-import socketserver
 
-class MinimalHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-    def do_GET(self):
-        if self.path == '/':
-            self.serve_minimal_gui()
-        else:
-            super().do_GET()
-
-    def serve_minimal_gui(self):
-        """Serve a minimal HTML page with just the tab switching functionality."""
-        html = """<!DOCTYPE html>
+# Minimal page with just the tab switching functionality
+_HTML = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -142,10 +130,25 @@ class MinimalHandler(http.server.SimpleHTTPRequestHandler):
 </body>
 </html>"""
 
+# Encoded once at import; every GET serves the same bytes
+_HTML_BYTES = _HTML.encode('utf-8')
+_HTML_LENGTH = str(len(_HTML_BYTES))
+
+
+class MinimalHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/':
+            self.serve_minimal_gui()
+        else:
+            super().do_GET()
+
+    def serve_minimal_gui(self):
+        """Serve a minimal HTML page with just the tab switching functionality."""
         self.send_response(200)
         self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', _HTML_LENGTH)
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.wfile.write(_HTML_BYTES)
 
 
 def start_minimal_server():
@@ -153,7 +156,9 @@ def start_minimal_server():
     port = 8085
     handler = MinimalHandler
 
-    with socketserver.TCPServer(("", port), handler) as httpd:
+    # ThreadingHTTPServer: one thread per connection (daemon threads, so
+    # Ctrl+C never waits on a stuck client) and SO_REUSEADDR for fast restarts
+    with http.server.ThreadingHTTPServer(("", port), handler) as httpd:
         print(f"🧪 Minimal WSC GUI running at http://localhost:{port}")
         print("Test the tab switching functionality here")
         print("Check browser console (F12) for debugging information")
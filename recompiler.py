@@ -1,6 +1,10 @@
 # recompiler.py
 # WSC Recompiler - Convert decompiled text back to WSC binary format
 
+import codecs
+from functools import lru_cache
+import mmap
+import os
 import re
 import struct
 from pathlib import Path
@@ -10,24 +14,72 @@ from typing import List, Tuple, Optional
 from decompiler import (
     re_japanese_name,
     SPEAKER_BYTE,
+    MMAP_THRESHOLD,
     decode_try,
-    sanitize
+    read_wsc_bytes,
+    sanitize,
+    write_output_bytes
 )
 
+try:
+    import recompiler_core
+except ImportError:  # Compiled core is optional; see recompiler_core.pyx
+    recompiler_core = None
+
+# Line prefixes that mark resource IDs, audio cues and engine commands
+_RESOURCE_PREFIXES = ('DAY', 'BG', 'ST', 'HOS', 'SE', 'BGM', '%')
+
+# One entry: an offset header line plus the content line that follows it. The
+# offsets are left loose here and checked with int() so bad headers get reported.
+# Trailing blank lines are swallowed so well-formed entries sit back to back.
+_RE_ENTRY = re.compile(
+    r'^[^\S\n]*<([^:\n]*):([^:\n]*)>[^\S\n]*$(?:\n([^\n]*))?(?:\n[^\S\n]*(?=\n))*',
+    re.MULTILINE
+)
+
+# Bound CP932 encoder: skips the codec-registry lookup str.encode does per call
+_cp932_encode = codecs.lookup('cp932').encode
+# Shift_JIS maps U+00A5 (¥) to 0x5C and U+203E (‾) to 0x7E; CP932 has no
+# mapping for either, so text holding them needs this second try
+_sjis_encode = codecs.lookup('shift_jis').encode
+
 
 class WSCEntry:
     """Represents a single WSC entry with its metadata."""
 
+    # Scripts hold tens of thousands of entries; slots drop the per-instance __dict__
+    __slots__ = ('start_offset', 'end_offset', '_content', '_is_speaker',
+                 'binary_data', 'warnings', 'errors', 'original_length')
+
     def __init__(self, start_offset: int, end_offset: int, content: str, is_speaker: bool = False):
         self.start_offset = start_offset
         self.end_offset = end_offset
-        self.content = content
-        self.is_speaker = is_speaker
+        self._content = content
+        self._is_speaker = is_speaker
         self.binary_data = None
         self.warnings = []
         self.errors = []
         self.original_length = end_offset - start_offset
 
+    # binary_data is cached between passes; editing what it is derived from drops it
+    @property
+    def content(self) -> str:
+        return self._content
+
+    @content.setter
+    def content(self, value: str):
+        self._content = value
+        self.binary_data = None
+
+    @property
+    def is_speaker(self) -> bool:
+        return self._is_speaker
+
+    @is_speaker.setter
+    def is_speaker(self, value: bool):
+        self._is_speaker = value
+        self.binary_data = None
+
     def __repr__(self):
         return f"WSCEntry({self.start_offset:08X}:{self.end_offset:08X}, speaker={self.is_speaker}, content='{self.content}')"
 
@@ -35,13 +87,35 @@ class WSCEntry:
 class ValidationResult:
     """Result of WSC content validation."""
 
+    # The message lists are created on first use: most results never get
+    # anything added to them
+    __slots__ = ('is_valid', '_errors', '_warnings', '_suggestions', 'needs_recalculation')
+
     def __init__(self):
         self.is_valid = False
-        self.errors = []
-        self.warnings = []
-        self.suggestions = []
+        self._errors = None
+        self._warnings = None
+        self._suggestions = None
         self.needs_recalculation = False
 
+    @property
+    def errors(self) -> List[str]:
+        if self._errors is None:
+            self._errors = []
+        return self._errors
+
+    @property
+    def warnings(self) -> List[str]:
+        if self._warnings is None:
+            self._warnings = []
+        return self._warnings
+
+    @property
+    def suggestions(self) -> List[str]:
+        if self._suggestions is None:
+            self._suggestions = []
+        return self._suggestions
+
     def add_error(self, error: str):
         """Add an error message."""
         self.errors.append(error)
@@ -56,6 +130,19 @@ class ValidationResult:
         self.suggestions.append(suggestion)
 
 
+def _report_unparsed(lines: List[str], first_line: int, result: ValidationResult) -> None:
+    """Record an error for each non-blank line that is not part of an entry."""
+    for line_no, line in enumerate(lines, first_line):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('<') and ':' in line and line.endswith('>'):
+            result.add_error(f"Invalid offset format on line {line_no}: {line}")
+            result.add_suggestion("Ensure format is <XXXXXXXX:XXXXXXXX>")
+        else:
+            result.add_error(f"Expected offset format on line {line_no}, got: {line[:50]}...")
+
+
 def parse_github_format(text: str) -> Tuple[List[WSCEntry], ValidationResult]:
     """
     Parse GitHub-style WSC format into WSCEntry objects.
@@ -69,54 +156,57 @@ def parse_github_format(text: str) -> Tuple[List[WSCEntry], ValidationResult]:
     entries = []
     result = ValidationResult()
 
-    lines = text.strip().split('\n')
-    i = 0
+    text = text.strip()
+    search = _RE_ENTRY.search
+    pos = 0
+    # Line numbers are only needed for error messages, so count them lazily
+    counted_pos = 0
+    counted_line = 1
 
-    while i < len(lines):
-        line = lines[i].strip()
+    while True:
+        match = search(text, pos)
+        gap_end = match.start() if match else len(text)
 
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
+        # Anything but the newline between two entries is a line the parser
+        # could not use
+        if gap_end - pos > 1 or (pos == 0 and gap_end):
+            counted_line += text.count('\n', counted_pos, pos)
+            counted_pos = pos
+            _report_unparsed(text[pos:gap_end].split('\n'), counted_line, result)
 
-        # Parse offset line
-        if line.startswith('<') and ':' in line and line.endswith('>'):
-            try:
-                # Extract start and end offsets
-                offset_content = line[1:-1]  # Remove < and >
-                start_hex, end_hex = offset_content.split(':')
-
-                start_offset = int(start_hex, 16)
-                end_offset = int(end_hex, 16)
-
-                # Get content (next line, or empty if end of file)
-                content = ""
-                if i + 1 < len(lines):
-                    content = lines[i + 1].strip()
+        if match is None:
+            break
 
-                # Detect if this is a speaker name (starts with .)
-                is_speaker = content.startswith('.') and len(content) > 1
+        start_hex, end_hex, content = match.groups()
+        try:
+            start_offset = int(start_hex, 16)
+            end_offset = int(end_hex, 16)
+        except ValueError:
+            # Bad header: report it and rescan from the next line, leaving the
+            # following line unconsumed
+            header_end = text.find('\n', gap_end)
+            if header_end == -1:
+                header_end = len(text)
+            counted_line += text.count('\n', counted_pos, gap_end)
+            counted_pos = gap_end
+            _report_unparsed([text[gap_end:header_end]], counted_line, result)
+            pos = header_end
+            continue
 
-                # Remove speaker dot for processing
-                clean_content = content[1:] if is_speaker else content
+        # Get content (next line, or empty if end of file)
+        content = content.strip() if content is not None else ""
 
-                # Restore literal \n to actual newlines
-                clean_content = clean_content.replace('\\n', '\n')
+        # Detect if this is a speaker name (starts with .)
+        is_speaker = content.startswith('.') and len(content) > 1
 
-                entry = WSCEntry(start_offset, end_offset, clean_content, is_speaker)
-                entries.append(entry)
+        # Remove speaker dot for processing
+        clean_content = content[1:] if is_speaker else content
 
-                i += 2  # Skip content line
+        # Restore literal \n to actual newlines
+        clean_content = clean_content.replace('\\n', '\n')
 
-            except ValueError as e:
-                result.add_error(f"Invalid offset format on line {i+1}: {line}")
-                result.add_suggestion("Ensure format is <XXXXXXXX:XXXXXXXX>")
-                i += 1
-        else:
-            # Invalid format line
-            result.add_error(f"Expected offset format on line {i+1}, got: {line[:50]}...")
-            i += 1
+        entries.append(WSCEntry(start_offset, end_offset, clean_content, is_speaker))
+        pos = match.end()
 
     # Validate the parsed entries
     if entries:
@@ -135,110 +225,106 @@ def parse_github_format(text: str) -> Tuple[List[WSCEntry], ValidationResult]:
     return entries, result
 
 
+def _encode_payload(text: str) -> bytes:
+    """Encode entry text for the WSC binary: CP932, then Shift_JIS, then fallbacks."""
+    try:
+        return _cp932_encode(text)[0]
+    except UnicodeEncodeError:
+        pass
+    try:
+        return _sjis_encode(text)[0]
+    except UnicodeEncodeError:
+        pass
+    # Spans the decompiler could only decode as latin-1 map straight back to their bytes
+    try:
+        return text.encode('latin-1')
+    except UnicodeEncodeError:
+        return _cp932_encode(text, 'replace')[0]
+
+
+@lru_cache(maxsize=4096)
 def content_to_binary(content: str, is_speaker: bool = False) -> bytes:
     """
     Convert text content back to WSC binary format.
     """
+    # Fast path for the common shape: an ASCII resource ID, audio cue or command.
+    # ASCII bytes are identical in CP932, so no codec or narration checks are needed.
+    if not is_speaker and content.isascii():
+        if not content or content.isspace():
+            return b'\x00'
+        return content.encode('ascii') + b'\x00'
+
+    stripped = content.strip()
+
     if is_speaker:
         # This was originally marked as speaker by decompiler, so convert back with double 0x0F
-        if content.strip():  # Not empty
-            try:
-                encoded = content.strip().encode('cp932')
-                return b'\x0F\x0F' + encoded + b'\x00'
-            except UnicodeEncodeError:
-                # Fallback encoding - handle problematic content
-                try:
-                    # Try different encodings
-                    for encoding in ['cp932', 'shift_jis', 'latin-1']:
-                        try:
-                            encoded = content.strip().encode(encoding)
-                            return b'\x0F\x0F' + encoded + b'\x00'
-                        except:
-                            continue
-                    # Last resort - replace problematic characters
-                    encoded = content.strip().encode('latin-1', errors='replace')
-                    return b'\x0F\x0F' + encoded + b'\x00'
-                except Exception:
-                    # Ultimate fallback - empty content
-                    return b'\x00'
+        if stripped:  # Not empty
+            return b'\x0F\x0F' + _encode_payload(stripped) + b'\x00'
         else:
             # Empty speaker - just return null terminator
             return b'\x00'
     else:
         # Regular content (resources, audio, commands, narration)
         # For narration that starts with 0x0F, we need to detect it
-        if content.strip():
-            # Check if this looks like narration (Japanese text without obvious resource pattern)
-            has_japanese = bool(re_japanese_name.search(content))
-            has_resource_pattern = bool(re.match(r'^(DAY|BG|ST|HOS|SE|BGM|%).*', content))
+        if stripped:
+            # Check if this looks like narration (Japanese text without obvious resource pattern).
+            # The cheap prefix test runs first so resource lines never reach the Japanese regex.
+            has_resource_pattern = content.startswith(_RESOURCE_PREFIXES)
+
+            # Pure-ASCII lines (the bulk of a script) can never hold Japanese,
+            # so str.isascii() settles them without running the regex
+            has_japanese = (not has_resource_pattern and not content.isascii()
+                            and re_japanese_name.search(content) is not None)
 
             # If it has Japanese characters but doesn't look like a resource/command, treat as narration
-            if has_japanese and not has_resource_pattern:
+            if has_japanese:
                 # This is likely narration that originally had single 0x0F
-                try:
-                    encoded = content.encode('cp932')
-                    return b'\x0F' + encoded + b'\x00'
-                except UnicodeEncodeError:
-                    # Fallback encoding for problematic content
-                    try:
-                        for encoding in ['cp932', 'shift_jis', 'latin-1']:
-                            try:
-                                encoded = content.encode(encoding)
-                                return b'\x0F' + encoded + b'\x00'
-                            except:
-                                continue
-                        encoded = content.encode('latin-1', errors='replace')
-                        return b'\x0F' + encoded + b'\x00'
-                    except Exception:
-                        return b'\x00'
+                return b'\x0F' + _encode_payload(content) + b'\x00'
             else:
                 # Regular content (resources, audio, commands)
-                try:
-                    return content.encode('cp932') + b'\x00'
-                except UnicodeEncodeError:
-                    # Fallback encoding for problematic content
-                    try:
-                        for encoding in ['cp932', 'shift_jis', 'latin-1']:
-                            try:
-                                encoded = content.encode(encoding)
-                                return encoded + b'\x00'
-                            except:
-                                continue
-                        encoded = content.encode('latin-1', errors='replace')
-                        return encoded + b'\x00'
-                    except Exception:
-                        return b'\x00'
+                return _encode_payload(content) + b'\x00'
         else:
             # Empty content
             return b'\x00'
 
 
+def _encode_entries(entries: List[WSCEntry]) -> None:
+    """Fill in binary_data for entries that do not have it cached yet."""
+    if recompiler_core is not None:
+        recompiler_core.encode_entries(entries, _encode_payload)
+        return
+
+    for entry in entries:
+        if entry.binary_data is None:
+            entry.binary_data = content_to_binary(entry.content, entry.is_speaker)
+
+
 def calculate_new_offsets(entries: List[WSCEntry]) -> None:
     """
     Recalculate offsets for all entries based on their binary data.
     """
+    # Generate binary data
+    _encode_entries(entries)
+
+    # A plain running sum: a NumPy cumsum measured slower here, since the
+    # lengths have to be gathered and the offsets written back per entry anyway
     current_offset = 0
 
     for entry in entries:
-        # Generate binary data
-        entry.binary_data = content_to_binary(entry.content, entry.is_speaker)
-
-        # Update offsets
+        # Update offsets and move to next position
         entry.start_offset = current_offset
-        entry.end_offset = current_offset + len(entry.binary_data) - 1  # -1 because we want inclusive end
-
-        # Move to next position
         current_offset += len(entry.binary_data)
+        entry.end_offset = current_offset - 1  # -1 because we want inclusive end
 
 
 def preserve_original_offsets(entries: List[WSCEntry]) -> bool:
     """
     Try to preserve original offsets. Returns True if successful, False if recalculation needed.
     """
-    for entry in entries:
-        # Generate binary data
-        entry.binary_data = content_to_binary(entry.content, entry.is_speaker)
+    # Generate binary data
+    _encode_entries(entries)
 
+    for entry in entries:
         # Check if length matches original
         expected_length = entry.original_length + 1  # +1 for null terminator
         actual_length = len(entry.binary_data)
@@ -253,21 +339,24 @@ def reconstruct_wsc_binary(entries: List[WSCEntry], preserve_offsets: bool = Tru
     """
     Reconstruct complete WSC binary file from entries.
     """
+    return reconstruct_wsc_binary_with_status(entries, preserve_offsets)[0]
+
+
+def reconstruct_wsc_binary_with_status(entries: List[WSCEntry], preserve_offsets: bool) -> Tuple[bytes, bool]:
+    """reconstruct_wsc_binary that also reports whether the original offsets held."""
+    preserved = False
     if preserve_offsets:
         # Try to preserve original offsets
-        if not preserve_original_offsets(entries):
+        preserved = preserve_original_offsets(entries)
+        if not preserved:
             # Fall back to recalculation
             calculate_new_offsets(entries)
     else:
         # Always recalculate
         calculate_new_offsets(entries)
 
-    # Combine all binary data
-    result = b''
-    for entry in entries:
-        result += entry.binary_data
-
-    return result
+    # Combine all binary data in one allocation (repeated += is quadratic)
+    return b''.join([entry.binary_data for entry in entries]), preserved
 
 
 def validate_wsc_entries(entries: List[WSCEntry]) -> ValidationResult:
@@ -275,35 +364,59 @@ def validate_wsc_entries(entries: List[WSCEntry]) -> ValidationResult:
     Validate WSC entries for potential issues.
     """
     result = ValidationResult()
+    prev_end = None
 
     for i, entry in enumerate(entries):
-        # Check content for encoding issues
-        try:
-            entry.content.encode('cp932')
-        except UnicodeEncodeError:
-            result.add_warning(f"Entry {i+1} contains characters not compatible with CP932")
-            result.add_suggestion(f"Consider modifying entry {i+1}: {entry.content[:50]}...")
+        content = entry.content
+        stripped = content.strip()
 
-        # Check speaker name format
+        # Check content for encoding issues (ASCII is always CP932-safe)
+        if not content.isascii():
+            try:
+                _cp932_encode(content)
+            except UnicodeEncodeError:
+                result.add_warning(f"Entry {i+1} contains characters not compatible with CP932")
+                result.add_suggestion(f"Consider modifying entry {i+1}: {content[:50]}...")
+
+        # Check speaker name format (the pattern's {1,8} already caps the length)
         if entry.is_speaker:
-            if not re_japanese_name.match(entry.content.strip()) or len(entry.content.strip()) > 8:
-                result.add_warning(f"Entry {i+1} speaker name format may be unusual: {entry.content}")
+            if not re_japanese_name.match(stripped):
+                result.add_warning(f"Entry {i+1} speaker name format may be unusual: {content}")
                 result.add_suggestion("Speaker names should be 1-8 Japanese characters")
 
         # Check for empty content
-        if not entry.content.strip():
+        if not stripped:
             result.add_warning(f"Entry {i+1} has empty content")
 
-    # Check for potential conflicts
-    for i in range(1, len(entries)):
-        if entries[i].start_offset <= entries[i-1].end_offset:
+        # Check for potential conflicts with the previous entry
+        if prev_end is not None and entry.start_offset <= prev_end:
             result.add_error(f"Offset conflict between entries {i} and {i+1}")
             result.needs_recalculation = True
+        prev_end = entry.end_offset
 
     result.is_valid = len(result.errors) == 0
     return result
 
 
+def _read_text(path: str) -> str:
+    """Read a UTF-8 text file with universal newlines, decoding it in one call."""
+    if os.path.getsize(path) > MMAP_THRESHOLD:
+        # Large input: decode straight out of the mapping, no bytes copy first
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as data:
+                text = str(data, 'utf-8')
+        finally:
+            os.close(fd)
+    else:
+        text = read_wsc_bytes(path).decode('utf-8')
+
+    # Same newline translation open(..., 'r') applies
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
 def recompile_wsc_file(input_txt_path: str, output_wsc_path: str,
                       preserve_offsets: bool = True) -> Tuple[bool, ValidationResult]:
     """
@@ -319,8 +432,7 @@ def recompile_wsc_file(input_txt_path: str, output_wsc_path: str,
     """
     # Read input file
     try:
-        with open(input_txt_path, 'r', encoding='utf-8') as f:
-            text_content = f.read()
+        text_content = _read_text(input_txt_path)
     except Exception as e:
         result = ValidationResult()
         result.add_error(f"Failed to read input file: {e}")
@@ -348,20 +460,20 @@ def recompile_wsc_file(input_txt_path: str, output_wsc_path: str,
 
     # Reconstruct binary
     try:
-        binary_data = reconstruct_wsc_binary(entries, preserve_offsets)
+        binary_data, preserved = reconstruct_wsc_binary_with_status(entries, preserve_offsets)
 
         # Write output file
         output_path = Path(output_wsc_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_wsc_path, 'wb') as f:
-            f.write(binary_data)
+        # Single raw write from a memoryview; no buffered-writer copy
+        write_output_bytes(output_wsc_path, binary_data)
 
         final_result.is_valid = True
 
         # Add success info
         final_result.add_suggestion(f"Successfully recompiled {len(entries)} entries")
-        if preserve_offsets and not preserve_original_offsets(entries):
+        if preserve_offsets and not preserved:
             final_result.add_warning("Offsets were recalculated due to content changes")
 
         return True, final_result
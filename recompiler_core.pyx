@@ -0,0 +1,70 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# recompiler_core.pyx
+# Optional compiled core for recompiler.content_to_binary over a whole entry list.
+# Build in place with:  cythonize -i recompiler_core.pyx
+# recompiler.py falls back to its per-entry Python loop when this is not built.
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize, PyBytes_GET_SIZE
+from libc.string cimport memcpy
+
+cdef tuple RESOURCE_PREFIXES = ('DAY', 'BG', 'ST', 'HOS', 'SE', 'BGM', '%')
+
+
+cdef bint is_japanese_name(str s):
+    """Same test as re_japanese_name.search: 1-8 kana/kanji, optional trailing newline."""
+    cdef Py_ssize_t n = len(s)
+    cdef Py_ssize_t i
+    cdef Py_UCS4 ch
+    if n and s[n - 1] == u'\n':
+        n -= 1
+    if n < 1 or n > 8:
+        return False
+    for i in range(n):
+        ch = s[i]
+        if not (0x3040 <= ch <= 0x30FF or 0x4E00 <= ch <= 0x9FFF):
+            return False
+    return True
+
+
+cdef bytes frame(bytes payload, Py_ssize_t prefix):
+    """Return prefix * 0x0F + payload + NUL in a single allocation."""
+    cdef Py_ssize_t n = PyBytes_GET_SIZE(payload)
+    cdef bytes out = PyBytes_FromStringAndSize(NULL, prefix + n + 1)
+    cdef char *buf = PyBytes_AS_STRING(out)
+    cdef Py_ssize_t i
+    for i in range(prefix):
+        buf[i] = 0x0F
+    memcpy(buf + prefix, PyBytes_AS_STRING(payload), n)
+    buf[prefix + n] = 0
+    return out
+
+
+def encode_entries(list entries, encode_payload):
+    """Set binary_data on entries lacking it, exactly as content_to_binary would.
+
+    encode_payload(text) is recompiler._encode_payload, so the CP932 and
+    fallback encoding rules stay defined in one place.
+    """
+    cdef str content
+    cdef str stripped
+    for entry in entries:
+        if entry.binary_data is not None:
+            continue
+        content = entry.content
+        if not entry.is_speaker and content.isascii():
+            # ASCII resource IDs and commands: bytes are the same in CP932
+            if not content or content.isspace():
+                entry.binary_data = b'\x00'
+            else:
+                entry.binary_data = frame(content.encode('ascii'), 0)
+            continue
+        stripped = content.strip()
+        if not stripped:
+            entry.binary_data = b'\x00'
+        elif entry.is_speaker:
+            entry.binary_data = frame(encode_payload(stripped), 2)
+        elif (not content.startswith(RESOURCE_PREFIXES) and not content.isascii()
+              and is_japanese_name(content)):
+            entry.binary_data = frame(encode_payload(content), 1)
+        else:
+            entry.binary_data = frame(encode_payload(content), 0)
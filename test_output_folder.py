@@ -2,9 +2,15 @@
 # test_output_folder.py
 # Test the output folder functionality
 
-import requests
 import tempfile
 import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from http_test_session import make_session
+
+# One pooled keep-alive session shared by every request in this module
+SESSION = make_session()
 
 def test_output_folder_api():
     """Test the output folder API endpoint."""
@@ -15,7 +21,7 @@ def test_output_folder_api():
 
     try:
         # Test output folder listing
-        response = requests.get(f"{base_url}/api/recompile/output", timeout=10)
+        response = SESSION.get(f"{base_url}/api/recompile/output", timeout=10)
 
         print(f"📡 API response status: {response.status_code}")
 
@@ -74,10 +80,9 @@ def test_compilation_with_output():
             "filename": "test_output.wsc"
         }
 
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/api/recompile/compile",
             json=compile_data,
-            headers={'Content-Type': 'application/json'},
             timeout=10
         )
 
@@ -93,7 +98,7 @@ def test_compilation_with_output():
                 print(f"   Entries: {data.get('entries_count')}")
 
                 # Test output folder listing again
-                output_response = requests.get(f"{base_url}/api/recompile/output", timeout=10)
+                output_response = SESSION.get(f"{base_url}/api/recompile/output", timeout=10)
                 if output_response.status_code == 200:
                     output_data = output_response.json()
                     if output_data.get('success') and output_data.get('total_files', 0) > 0:
@@ -109,7 +114,6 @@ def test_compilation_with_output():
 
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -117,11 +121,14 @@ if __name__ == "__main__":
     print("🗂️ Testing Recompiler Output Folder Functionality")
     print("=" * 60)
 
-    # Test 1: Output folder API
-    success1 = test_output_folder_api()
-
-    # Test 2: Compilation with output folder
-    success2 = test_compilation_with_output()
+    # Both tests only wait on the server, so run them side by side:
+    # Test 1 (output folder API) is read-only, and Test 2 (compilation with
+    # output folder) does its own listing after its compile finishes
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        future1 = pool.submit(test_output_folder_api)
+        future2 = pool.submit(test_compilation_with_output)
+        success1 = future1.result()
+        success2 = future2.result()
 
     overall_success = success1 and success2
 
@@ -2,9 +2,12 @@
 # test_recompiler.py
 # Comprehensive test suite for WSC recompiler functionality
 
+import mmap
 import os
 import sys
 import tempfile
+import traceback
+from functools import lru_cache
 from pathlib import Path
 
 # Add current directory to path for imports
@@ -21,7 +24,24 @@ from recompiler import (
 from validator import WSCValidator
 from decompiler import decompile_wsc_file
 
+# Per-step dumps of intermediate data; set WSC_TEST_VERBOSE=1 to see them
+VERBOSE = os.environ.get("WSC_TEST_VERBOSE") == "1"
 
+# WSCValidator keeps no per-call state, so one instance serves every test
+_VALIDATOR = WSCValidator()
+
+
+# Binary fixture for the round-trip test
+_TEST_WSC_DATA = (
+    b"DAY0904\x00"
+    b"\x0F\x0F\x96\xe9\x8b\x56\x00"  # 夜久 in CP932
+    b"\x0F\x82\xb1\x82\xf1\x82\xc9\x82\xbf\x82\xcd\x90\xa2\x8a\xc5\x00"  # こんにちは世界 in CP932
+    b"SE_104.ogg\x00"
+    b"%K%P\x00"
+)
+
+
+@lru_cache(maxsize=1)
 def create_test_text_content():
     """Create test content in GitHub-style format."""
     return """<00000000:00000007>
@@ -56,12 +76,18 @@ ST13A05S
 """
 
 
+@lru_cache(maxsize=4)
+def _cached_parse(content):
+    """Parse once per fixture; only for tests that leave the entries untouched."""
+    return parse_github_format(content)
+
+
 def test_parse_github_format():
     """Test parsing of GitHub-style format."""
     print("🧪 Testing parse_github_format...")
 
     content = create_test_text_content()
-    entries, result = parse_github_format(content)
+    entries, result = _cached_parse(content)
 
     # Check parsing results
     assert result.is_valid, f"Parsing failed: {result.errors}"
@@ -78,6 +104,11 @@ def test_parse_github_format():
     return entries
 
 
+def _check_prefix(binary, prefix, suffix=b'\x00'):
+    """True if binary starts with prefix and ends with suffix."""
+    return binary[:len(prefix)] == prefix and binary[-len(suffix):] == suffix
+
+
 def test_content_to_binary():
     """Test content to binary conversion."""
     print("🧪 Testing content_to_binary...")
@@ -89,18 +120,33 @@ def test_content_to_binary():
 
     # Test speaker name (Japanese) - this is marked as speaker, so gets double 0x0F
     binary = content_to_binary("夜久", True)
-    assert binary.startswith(b'\x0F\x0F'), "Speaker should start with double 0x0F"
-    assert binary.endswith(b'\x00'), "Should end with null terminator"
+    assert _check_prefix(binary, b'\x0F\x0F'), "Speaker should be double 0x0F ... NUL"
 
     # Test narration (Japanese) - this is NOT marked as speaker, so gets single 0x0F
     binary = content_to_binary("こんにちは世界", False)
-    assert binary.startswith(b'\x0F'), "Narration should start with single 0x0F"
-    assert not binary.startswith(b'\x0F\x0F'), "Narration should not start with double 0x0F"
-    assert binary.endswith(b'\x00'), "Should end with null terminator"
+    assert _check_prefix(binary, b'\x0F'), "Narration should be single 0x0F ... NUL"
+    assert binary[1:2] != b'\x0F', "Narration should not start with double 0x0F"
 
     print("✅ content_to_binary test passed")
 
 
+def test_shift_jis_fallback():
+    """Test characters only Shift_JIS can encode (CP932 has no ¥ or ‾)."""
+    print("🧪 Testing Shift_JIS fallback...")
+
+    # Plain content: ¥ -> 0x5C, ‾ -> 0x7E
+    assert content_to_binary("¥100", False) == b"\\100\x00"
+    assert content_to_binary("‾", False) == b"~\x00"
+
+    # Longer lines and speakers keep their Japanese text around the ¥
+    expected = "価格は¥100です".encode('shift_jis')
+    assert b"\\100" in expected
+    assert content_to_binary("価格は¥100です", False).endswith(expected + b'\x00')
+    assert content_to_binary("価格は¥100です", True) == b'\x0F\x0F' + expected + b'\x00'
+
+    print("✅ Shift_JIS fallback test passed")
+
+
 def test_reconstruct_wsc_binary():
     """Test WSC binary reconstruction."""
     print("🧪 Testing reconstruct_wsc_binary...")
@@ -122,66 +168,77 @@ def test_reconstruct_wsc_binary():
     print(f"✅ reconstruct_wsc_binary test passed ({len(binary)} bytes)")
 
 
+def _scan_strings(data):
+    """Return (NUL count, non-blank CP932 strings) from one pass over data.
+
+    data may be bytes or a read-only mmap; both support find() and slicing.
+    """
+    nulls = 0
+    strings = []
+    pos = 0
+    while True:
+        end = data.find(b'\x00', pos)
+        last = end == -1
+        if last:
+            end = len(data)
+        else:
+            nulls += 1
+        if end > pos:
+            text = data[pos:end].decode('cp932', errors='ignore')
+            if text.strip():
+                strings.append(text)
+        if last:
+            return nulls, strings
+        pos = end + 1
+
+
 def test_round_trip():
     """Test complete round-trip: WSC → text → WSC."""
     print("🧪 Testing round-trip conversion...")
 
-    # Create test WSC file
-    test_wsc_data = (
-        b"DAY0904\x00"
-        b"\x0F\x0F\x96\xe9\x8b\x56\x00"  # 夜久 in CP932
-        b"\x0F\x82\xb1\x82\xf1\x82\xc9\x82\xbf\x82\xcd\x90\xa2\x8a\xc5\x00"  # こんにちは世界 in CP932
-        b"SE_104.ogg\x00"
-        b"%K%P\x00"
-    )
+    # One scratch directory for all three files; cleaned up as a whole
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_wsc_path = os.path.join(temp_dir, "in.wsc")
+        temp_txt_path = os.path.join(temp_dir, "mid.txt")
+        recompiled_path = os.path.join(temp_dir, "out.wsc")
 
-    with tempfile.NamedTemporaryFile(suffix='.wsc', delete=False) as temp_wsc:
-        temp_wsc.write(test_wsc_data)
-        temp_wsc_path = temp_wsc.name
+        with open(temp_wsc_path, 'wb') as f:
+            f.write(_TEST_WSC_DATA)
 
-    try:
         # Step 1: Decompile
-        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as temp_txt:
-            temp_txt_path = temp_txt.name
-
         decompile_wsc_file(temp_wsc_path, temp_txt_path)
 
         # Step 2: Read decompiled content
         with open(temp_txt_path, 'r', encoding='utf-8') as f:
             decompiled_content = f.read()
 
-        print(f"📄 Decompiled content ({len(decompiled_content)} chars):")
-        print(decompiled_content[:200] + "..." if len(decompiled_content) > 200 else decompiled_content)
+        if VERBOSE:
+            print(f"📄 Decompiled content ({len(decompiled_content)} chars):")
+            print(decompiled_content[:200] + "..." if len(decompiled_content) > 200 else decompiled_content)
 
         # Step 3: Recompile
-        with tempfile.NamedTemporaryFile(suffix='.wsc', delete=False) as recompiled_wsc:
-            recompiled_path = recompiled_wsc.name
-
         success, result = recompile_wsc_file(temp_txt_path, recompiled_path, preserve_offsets=False)
 
         assert success, f"Recompilation failed: {result.errors}"
         assert result.is_valid, f"Recompilation validation failed: {result.errors}"
 
-        # Step 4: Compare results
-        with open(recompiled_path, 'rb') as f:
-            recompiled_data = f.read()
+        # Step 4: Compare results, scanning the recompiled file in place
+        with open(recompiled_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as recompiled_data:
+            if VERBOSE:
+                print(f"📊 Original: {len(_TEST_WSC_DATA)} bytes")
+                print(f"📊 Recompiled: {len(recompiled_data)} bytes")
 
-        print(f"📊 Original: {len(test_wsc_data)} bytes")
-        print(f"📊 Recompiled: {len(recompiled_data)} bytes")
+            recompiled_nulls, recompiled_strings = _scan_strings(recompiled_data)
 
-        # Check that both have null terminators
-        assert test_wsc_data.count(b'\x00') == recompiled_data.count(b'\x00'), "Null terminator count mismatch"
-
-        # Check content preservation (allowing for offset differences)
-        original_strings = [s.decode('cp932', errors='ignore') for s in test_wsc_data.split(b'\x00') if s]
-        recompiled_strings = [s.decode('cp932', errors='ignore') for s in recompiled_data.split(b'\x00') if s]
+        original_nulls, original_strings = _scan_strings(_TEST_WSC_DATA)
 
-        # Remove empty strings
-        original_strings = [s for s in original_strings if s.strip()]
-        recompiled_strings = [s for s in recompiled_strings if s.strip()]
+        # Check that both have null terminators
+        assert original_nulls == recompiled_nulls, "Null terminator count mismatch"
 
-        print(f"📋 Original strings: {original_strings}")
-        print(f"📋 Recompiled strings: {recompiled_strings}")
+        if VERBOSE:
+            print(f"📋 Original strings: {original_strings}")
+            print(f"📋 Recompiled strings: {recompiled_strings}")
 
         # Content should be preserved (order might differ due to offset recalculation)
         for orig_str in original_strings:
@@ -189,25 +246,18 @@ def test_round_trip():
                 found = any(orig_str in recomp_str for recomp_str in recompiled_strings)
                 assert found, f"Original string '{orig_str}' not found in recompiled data"
 
-        print("✅ Round-trip test passed")
-
-        # Cleanup
-        os.unlink(temp_txt_path)
-        os.unlink(recompiled_path)
-
-    finally:
-        os.unlink(temp_wsc_path)
+    print("✅ Round-trip test passed")
 
 
 def test_validation():
     """Test validator functionality."""
     print("🧪 Testing validator...")
 
-    validator = WSCValidator()
+    validator = _VALIDATOR
 
     # Test valid content
     valid_content = create_test_text_content()
-    entries, _ = parse_github_format(valid_content)
+    entries, _ = _cached_parse(valid_content)
     result = validator.comprehensive_validation(valid_content, entries)
 
     assert result.is_valid, f"Valid content should pass validation: {result.errors}"
@@ -234,12 +284,12 @@ def test_speaker_detection():
 
     # Test speaker name conversion (marked as speaker)
     speaker_binary = content_to_binary("夜久", True)
-    assert speaker_binary.startswith(b'\x0F\x0F'), "Japanese speaker name should use double 0x0F"
+    assert _check_prefix(speaker_binary, b'\x0F\x0F'), "Japanese speaker name should use double 0x0F"
 
     # Test narration conversion (NOT marked as speaker)
     narration_binary = content_to_binary("こんにちは世界", False)
-    assert narration_binary.startswith(b'\x0F'), "Narration should use single 0x0F"
-    assert not narration_binary.startswith(b'\x0F\x0F'), "Narration should not use double 0x0F"
+    assert _check_prefix(narration_binary, b'\x0F'), "Narration should use single 0x0F"
+    assert narration_binary[1:2] != b'\x0F', "Narration should not use double 0x0F"
 
     # Test empty content
     empty_binary = content_to_binary("", True)
@@ -252,7 +302,7 @@ def test_encoding_handling():
     """Test encoding compatibility and error handling."""
     print("🧪 Testing encoding handling...")
 
-    validator = WSCValidator()
+    validator = _VALIDATOR
 
     # Test CP932 compatible text
     cp932_text = "DAY0904"
@@ -277,8 +327,7 @@ def test_api_simulation():
     entries, parse_result = parse_github_format(content)
 
     # Simulate validation workflow
-    validator = WSCValidator()
-    validation_result = validator.comprehensive_validation(content, entries)
+    validation_result = _VALIDATOR.comprehensive_validation(content, entries)
 
     # Simulate compilation workflow
     binary = reconstruct_wsc_binary(entries, preserve_offsets=False)
@@ -299,6 +348,7 @@ def run_all_tests():
     tests = [
         test_parse_github_format,
         test_content_to_binary,
+        test_shift_jis_fallback,
         test_reconstruct_wsc_binary,
         test_round_trip,
         test_validation,
@@ -316,7 +366,6 @@ def run_all_tests():
             passed += 1
         except Exception as e:
             print(f"❌ {test.__name__} failed: {e}")
-            import traceback
             traceback.print_exc()
             failed += 1
         print()
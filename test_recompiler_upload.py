@@ -2,10 +2,16 @@
 # test_recompiler_upload.py
 # Test the recompiler upload functionality
 
-import requests
-import tempfile
-import os
+import io
+import traceback
+from functools import lru_cache
 
+from http_test_session import make_session
+
+# One pooled keep-alive session shared by every request in this module
+SESSION = make_session()
+
+@lru_cache(maxsize=1)
 def create_test_txt_file():
     """Create a test decompiled WSC file."""
     content = """<00000000:00000007>
@@ -36,48 +42,30 @@ def test_recompiler_upload():
         # Create test file content
         test_content = create_test_txt_file()
 
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
-            f.write(test_content)
-            temp_file_path = f.name
-
-        print(f"📄 Created test file: {temp_file_path}")
-
-        try:
-            # Test file upload
-            with open(temp_file_path, 'rb') as f:
-                files = {'file': ('test.txt', f, 'text/plain')}
-                response = requests.post(f"{base_url}/api/recompile/upload", files=files, timeout=10)
-
-            print(f"📡 Upload response status: {response.status_code}")
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    print("✅ Upload successful!")
-                    print(f"   Filename: {data.get('filename')}")
-                    print(f"   Entries parsed: {len(data.get('entries', []))}")
-                    print(f"   Parse valid: {data.get('parse_result', {}).get('valid', False)}")
-                    print(f"   Validation valid: {data.get('validation_result', {}).get('valid', False)}")
-                    return True
-                else:
-                    print(f"❌ Upload failed: {data.get('message')}")
-                    return False
+        # Upload straight from memory - no temp file to create or unlink
+        files = {'file': ('test.txt', io.BytesIO(test_content.encode('utf-8')), 'text/plain')}
+        response = SESSION.post(f"{base_url}/api/recompile/upload", files=files, timeout=10)
+
+        print(f"📡 Upload response status: {response.status_code}")
+
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success'):
+                print("✅ Upload successful!")
+                print(f"   Filename: {data.get('filename')}")
+                print(f"   Entries parsed: {len(data.get('entries', []))}")
+                print(f"   Parse valid: {data.get('parse_result', {}).get('valid', False)}")
+                print(f"   Validation valid: {data.get('validation_result', {}).get('valid', False)}")
+                return True
             else:
-                print(f"❌ HTTP error: {response.status_code}")
+                print(f"❌ Upload failed: {data.get('message')}")
                 return False
-
-        finally:
-            # Cleanup
-            try:
-                os.unlink(temp_file_path)
-                print(f"🧹 Cleaned up test file")
-            except:
-                pass
+        else:
+            print(f"❌ HTTP error: {response.status_code}")
+            return False
 
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -3,12 +3,15 @@
 # Simple test server for debugging JavaScript issues
 
 import http.server
-import socketserver
 import os
+from functools import partial
+
+# Serve from the script's own folder, resolved once instead of per request
+SERVE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 class TestHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    # Small responses go out immediately instead of waiting on Nagle's algorithm
+    disable_nagle_algorithm = True
 
     def do_GET(self):
         if self.path == '/':
@@ -18,9 +21,10 @@ class TestHandler(http.server.SimpleHTTPRequestHandler):
 def start_test_server():
     """Start a simple test server."""
     port = 8084
-    handler = TestHandler
+    handler = partial(TestHandler, directory=SERVE_DIR)
 
-    with socketserver.TCPServer(("", port), handler) as httpd:
+    # Threaded (daemon threads, address reuse) so subresources load in parallel
+    with http.server.ThreadingHTTPServer(("", port), handler) as httpd:
         print(f"🧪 Test server running at http://localhost:{port}")
         print("Open this URL in your browser to test tab switching")
         print("Check the browser console for debugging information")
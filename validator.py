@@ -1,58 +1,79 @@
 # validator.py
 # WSC content validation and error detection system
 
+import codecs
 import re
 from typing import List, Dict, Any, Tuple
-from recompiler import WSCEntry, ValidationResult, suggest_repair
+from recompiler import WSCEntry, ValidationResult, content_to_binary, suggest_repair
+
+try:
+    import validator_core  # Optional compiled offset scan; see validator_core.pyx
+except ImportError:
+    validator_core = None
+
+# Bound once; skips the per-call codec registry lookup of str.encode('cp932')
+_cp932_encode = codecs.lookup('cp932').encode
+
+
+# Compiled once per process and shared by every WSCValidator
+_ENCODING_PATTERNS = {
+    'cp932': re.compile(r'[\x00-\x7F\x81-\x9F\xE0-\xEF\xFA-\xFC]'),
+    'ascii': re.compile(r'[\x00-\x7F]'),
+    'japanese': re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
+}
+
+_WSC_PATTERNS = {
+    'resource_id': re.compile(r'^(DAY|BG|ST|HOS)_[0-9A-Za-z_]+$', re.I),
+    'audio_file': re.compile(r'^(SE|BGM)_[0-9A-Za-z_.-]+$', re.I),
+    'engine_command': re.compile(r'^%[A-Za-z0-9_]+%?$'),
+    'speaker_name': re.compile(r'^[\u3040-\u30FF\u4E00-\u9FFF]{1,8}$'),
+    'offset_line': re.compile(r'^<([0-9A-Fa-f]{8}):([0-9A-Fa-f]{8})>$')
+}
 
 
 class WSCValidator:
     """Comprehensive WSC content validator."""
 
-    def __init__(self):
-        self.encoding_patterns = {
-            'cp932': r'[\x00-\x7F\x81-\x9F\xE0-\xEF\xFA-\xFC]',
-            'ascii': r'[\x00-\x7F]',
-            'japanese': r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]'
-        }
+    encoding_patterns = _ENCODING_PATTERNS
+    wsc_patterns = _WSC_PATTERNS
 
-        self.wsc_patterns = {
-            'resource_id': re.compile(r'^(DAY|BG|ST|HOS)_[0-9A-Za-z_]+$', re.I),
-            'audio_file': re.compile(r'^(SE|BGM)_[0-9A-Za-z_.-]+$', re.I),
-            'engine_command': re.compile(r'^%[A-Za-z0-9_]+%?$'),
-            'speaker_name': re.compile(r'^[\u3040-\u30FF\u4E00-\u9FFF]{1,8}$'),
-            'offset_line': re.compile(r'^<([0-9A-Fa-f]{8}):([0-9A-Fa-f]{8})>$')
-        }
+    # Any character outside hiragana, katakana and CJK ideographs
+    _NON_JP_RE = re.compile(r'[^\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
 
     def validate_format_structure(self, text: str) -> ValidationResult:
         """Validate the overall GitHub-style format structure."""
         result = ValidationResult()
 
         lines = text.strip().split('\n')
+        line_count = len(lines)
+        match_offset = self.wsc_patterns['offset_line'].match
         i = 0
         entry_count = 0
 
-        while i < len(lines):
-            line = lines[i].strip()
+        while i < line_count:
+            line = lines[i]
+
+            # Well-formed offset lines match as-is; strip only the rest
+            if not match_offset(line):
+                line = line.strip()
 
-            if not line:
-                i += 1
-                continue
+                if not line:
+                    i += 1
+                    continue
 
-            # Check for offset line
-            if not self.wsc_patterns['offset_line'].match(line):
-                result.add_error(f"Line {i+1}: Invalid offset format '{line[:30]}...'")
-                result.add_suggestion("Use format <XXXXXXXX:XXXXXXXX>")
-                i += 1
-                continue
+                # Check for offset line; it is exactly 19 characters long
+                if len(line) != 19 or not match_offset(line):
+                    result.add_error(f"Line {i+1}: Invalid offset format '{line[:30]}...'")
+                    result.add_suggestion("Use format <XXXXXXXX:XXXXXXXX>")
+                    i += 1
+                    continue
 
             # Check for content line
-            if i + 1 >= len(lines):
+            if i + 1 >= line_count:
                 result.add_error(f"Line {i+1}: Missing content for offset {line}")
                 result.add_suggestion("Add content line after each offset")
                 break
 
-            content = lines[i + 1].strip()
             entry_count += 1
             i += 2
 
@@ -66,51 +87,71 @@ class WSCValidator:
     def validate_encoding_compatibility(self, content: str) -> ValidationResult:
         """Check if content can be encoded to CP932."""
         result = ValidationResult()
+        self._validate_encoding_into(content, result)
+        return result
+
+    def _validate_encoding_into(self, content: str, result: ValidationResult,
+                                prefix: str = '', suggest: bool = True) -> None:
+        """Append CP932 encoding problems in content to result."""
+        # ASCII maps 1:1 onto CP932, so only non-ASCII text needs the codec
+        if content.isascii():
+            return
 
         try:
-            content.encode('cp932')
+            _cp932_encode(content)
         except UnicodeEncodeError as e:
-            result.add_error(f"Encoding error: {e}")
-            result.add_suggestion("Replace problematic characters with CP932-compatible alternatives")
-
-        return result
+            result.errors.append(f"{prefix}Encoding error: {e}")
+            if suggest:
+                result.suggestions.append("Replace problematic characters with CP932-compatible alternatives")
 
     def validate_speaker_detection(self, content: str, is_speaker: bool) -> ValidationResult:
         """Validate speaker name detection and format."""
         result = ValidationResult()
-
         if is_speaker:
-            clean_name = content.strip()
+            self._validate_speaker_into(content, result)
+        return result
 
-            if not clean_name:
-                result.add_warning("Empty speaker name detected")
-                result.add_suggestion("Provide a valid speaker name or remove speaker prefix")
+    def _validate_speaker_into(self, content: str, result: ValidationResult,
+                               prefix: str = '', suggest: bool = True) -> None:
+        """Append speaker name problems in content to result."""
+        clean_name = content.strip()
 
-            elif not self.wsc_patterns['speaker_name'].match(clean_name):
-                result.add_warning(f"Unusual speaker name format: '{clean_name}'")
-                result.add_suggestion("Speaker names should be 1-8 Japanese characters")
+        if not clean_name:
+            result.warnings.append(f"{prefix}Empty speaker name detected")
+            if suggest:
+                result.suggestions.append("Provide a valid speaker name or remove speaker prefix")
 
-                # Check if it might be narration instead
-                if len(clean_name) > 8 or re.search(r'[^\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', clean_name):
-                    result.add_suggestion("Consider removing speaker prefix (.) if this is narration")
+        elif not self.wsc_patterns['speaker_name'].match(clean_name):
+            result.warnings.append(f"{prefix}Unusual speaker name format: '{clean_name}'")
+            if suggest:
+                result.suggestions.append("Speaker names should be 1-8 Japanese characters")
 
-        return result
+                # Check if it might be narration instead
+                if len(clean_name) > 8 or self._NON_JP_RE.search(clean_name):
+                    result.suggestions.append("Consider removing speaker prefix (.) if this is narration")
 
     def validate_content_categories(self, content: str) -> ValidationResult:
         """Validate content against known WSC categories."""
         result = ValidationResult()
+        self._validate_category_into(content, result)
+        return result
+
+    def _validate_category_into(self, content: str, result: ValidationResult,
+                                prefix: str = '', suggest: bool = True) -> None:
+        """Append category problems in content to result."""
+        patterns = self.wsc_patterns
 
         # Check for known patterns
-        if self.wsc_patterns['resource_id'].match(content):
+        if patterns['resource_id'].match(content):
             # Resource ID - check format
             pass
 
-        elif self.wsc_patterns['audio_file'].match(content):
+        elif patterns['audio_file'].match(content):
             # Audio file - check format
             if not content.lower().endswith(('.ogg', '.wav', '.mp3')) and not content.startswith('BGM_'):
-                result.add_warning(f"Audio file may have unusual extension: {content}")
+                result.warnings.append(f"{prefix}Audio file may have unusual extension: {content}")
 
-        elif self.wsc_patterns['engine_command'].match(content):
+        elif patterns['engine_command'].match(content):
             # Engine command - check format
             pass
 
@@ -120,16 +161,15 @@ class WSCValidator:
 
         elif content:
             # Regular content - check if it might be Japanese text
-            if re.search(self.encoding_patterns['japanese'], content):
+            if self.encoding_patterns['japanese'].search(content):
                 # Japanese text - this is fine
                 pass
             else:
                 # Non-Japanese, non-standard content
                 if len(content) < 3:
-                    result.add_warning(f"Short content may be filtered: '{content}'")
-                    result.add_suggestion("Consider removing or expanding this content")
-
-        return result
+                    result.warnings.append(f"{prefix}Short content may be filtered: '{content}'")
+                    if suggest:
+                        result.suggestions.append("Consider removing or expanding this content")
 
     def validate_offset_consistency(self, entries: List[WSCEntry]) -> ValidationResult:
         """Validate offset consistency and detect conflicts."""
@@ -139,23 +179,40 @@ class WSCValidator:
             result.add_error("No entries to validate")
             return result
 
-        # Check for proper ordering
-        for i in range(1, len(entries)):
-            if entries[i].start_offset <= entries[i-1].start_offset:
-                result.add_error(f"Offset ordering issue: entry {i+1} ({entries[i].start_offset:08X}) starts before entry {i} ({entries[i-1].start_offset:08X})")
+        # Only pairs where an entry does not directly follow the previous one
+        # can have findings; the compiled core finds those without visiting
+        # the rest from Python
+        pairs = range(1, len(entries))
+        if validator_core is not None:
+            try:
+                pairs = validator_core.scan_offsets(entries)
+            except (TypeError, OverflowError):
+                pass  # offsets that are not machine integers take the Python path
+
+        # Ordering, overlap and gaps per pair; gap suggestions are held back
+        # so they still follow the conflict ones
+        gap_suggestions = []
+        for i in pairs:
+            start = entries[i].start_offset
+            prev_start = entries[i-1].start_offset
+            prev_end = entries[i-1].end_offset
+
+            if start <= prev_start:
+                result.add_error(f"Offset ordering issue: entry {i+1} ({start:08X}) starts before entry {i} ({prev_start:08X})")
                 result.add_suggestion("Enable offset recalculation or fix offset values")
 
-            if entries[i].start_offset <= entries[i-1].end_offset:
+            if start <= prev_end:
                 result.add_error(f"Offset overlap: entry {i} overlaps with entry {i+1}")
                 result.add_suggestion("Recalculate all offsets to resolve conflicts")
 
-        # Check for gaps
-        for i in range(1, len(entries)):
-            gap = entries[i].start_offset - entries[i-1].end_offset - 1
+            gap = start - prev_end - 1
             if gap > 0:
                 result.add_warning(f"Gap detected: {gap} bytes between entries {i} and {i+1}")
                 if gap > 100:
-                    result.add_suggestion("Large gap may indicate missing data")
+                    gap_suggestions.append("Large gap may indicate missing data")
+
+        for suggestion in gap_suggestions:
+            result.add_suggestion(suggestion)
 
         result.is_valid = len(result.errors) == 0
         return result
@@ -165,22 +222,27 @@ class WSCValidator:
         result = ValidationResult()
 
         for i, entry in enumerate(entries):
-            if entry.binary_data is None:
-                # Generate binary data for validation
-                from recompiler import content_to_binary
-                entry.binary_data = content_to_binary(entry.content, entry.is_speaker)
-
-            actual_length = len(entry.binary_data)
-            expected_length = entry.original_length + 1  # +1 for null terminator
-
-            if actual_length != expected_length:
-                result.add_warning(f"Entry {i+1}: Length changed from {expected_length} to {actual_length} bytes")
-                result.add_suggestion(f"Content: '{entry.content[:30]}...' - Consider enabling offset recalculation")
-                result.needs_recalculation = True
+            self._validate_binary_into(entry, result, f"Entry {i+1}: ")
 
         result.is_valid = len(result.errors) == 0
         return result
 
+    def _validate_binary_into(self, entry: WSCEntry, result: ValidationResult,
+                              prefix: str = '', suggest: bool = True) -> None:
+        """Append a warning to result if entry's encoded length has changed."""
+        if entry.binary_data is None:
+            # Generate binary data for validation
+            entry.binary_data = content_to_binary(entry.content, entry.is_speaker)
+
+        actual_length = len(entry.binary_data)
+        expected_length = entry.original_length + 1  # +1 for null terminator
+
+        if actual_length != expected_length:
+            result.warnings.append(f"{prefix}Length changed from {expected_length} to {actual_length} bytes")
+            if suggest:
+                result.suggestions.append(f"Content: '{entry.content[:30]}...' - Consider enabling offset recalculation")
+            result.needs_recalculation = True
+
     def comprehensive_validation(self, text: str, entries: List[WSCEntry] = None) -> ValidationResult:
         """Perform comprehensive validation of WSC content."""
         final_result = ValidationResult()
@@ -191,28 +253,20 @@ class WSCValidator:
         final_result.warnings.extend(format_result.warnings)
 
         if entries:
-            # Individual entry validation
+            # Per-entry checks in one pass, appending straight into the
+            # final result; comprehensive results carry no suggestions.
+            # Length-change warnings are held back so they still follow
+            # the offset warnings
+            binary_result = ValidationResult()
             for i, entry in enumerate(entries):
-                # Encoding compatibility
-                encoding_result = self.validate_encoding_compatibility(entry.content)
-                if encoding_result.errors:
-                    final_result.errors.extend([f"Entry {i+1}: {err}" for err in encoding_result.errors])
-                if encoding_result.warnings:
-                    final_result.warnings.extend([f"Entry {i+1}: {warn}" for warn in encoding_result.warnings])
-
-                # Speaker detection
-                speaker_result = self.validate_speaker_detection(entry.content, entry.is_speaker)
-                if speaker_result.errors:
-                    final_result.errors.extend([f"Entry {i+1}: {err}" for err in speaker_result.errors])
-                if speaker_result.warnings:
-                    final_result.warnings.extend([f"Entry {i+1}: {warn}" for warn in speaker_result.warnings])
-
-                # Content categories
-                content_result = self.validate_content_categories(entry.content)
-                if content_result.errors:
-                    final_result.errors.extend([f"Entry {i+1}: {err}" for err in content_result.errors])
-                if content_result.warnings:
-                    final_result.warnings.extend([f"Entry {i+1}: {warn}" for warn in content_result.warnings])
+                prefix = f"Entry {i+1}: "
+                content = entry.content
+
+                self._validate_encoding_into(content, final_result, prefix, suggest=False)
+                if entry.is_speaker:
+                    self._validate_speaker_into(content, final_result, prefix, suggest=False)
+                self._validate_category_into(content, final_result, prefix, suggest=False)
+                self._validate_binary_into(entry, binary_result, prefix, suggest=False)
 
             # Offset consistency
             offset_result = self.validate_offset_consistency(entries)
@@ -222,7 +276,6 @@ class WSCValidator:
                 final_result.needs_recalculation = True
 
             # Binary consistency
-            binary_result = self.validate_binary_consistency(entries)
             final_result.warnings.extend(binary_result.warnings)
             if binary_result.needs_recalculation:
                 final_result.needs_recalculation = True
@@ -232,31 +285,29 @@ class WSCValidator:
 
     def generate_repair_suggestions(self, validation_result: ValidationResult) -> List[Dict[str, Any]]:
         """Generate structured repair suggestions from validation result."""
-        suggestions = []
-
-        for error in validation_result.errors:
-            suggestions.append({
-                'type': 'error',
-                'message': error,
-                'repair': suggest_repair('invalid_format'),
-                'auto_fixable': False
-            })
-
-        for warning in validation_result.warnings:
-            suggestions.append({
-                'type': 'warning',
-                'message': warning,
-                'repair': suggest_repair('invalid_format', warning),
-                'auto_fixable': False
-            })
-
-        for suggestion in validation_result.suggestions:
-            suggestions.append({
-                'type': 'suggestion',
-                'message': suggestion,
-                'repair': suggestion,
-                'auto_fixable': False
-            })
+        # 'invalid_format' repair text does not depend on the message
+        repair = suggest_repair('invalid_format')
+
+        suggestions = [{
+            'type': 'error',
+            'message': error,
+            'repair': repair,
+            'auto_fixable': False
+        } for error in validation_result.errors]
+
+        suggestions += [{
+            'type': 'warning',
+            'message': warning,
+            'repair': repair,
+            'auto_fixable': False
+        } for warning in validation_result.warnings]
+
+        suggestions += [{
+            'type': 'suggestion',
+            'message': suggestion,
+            'repair': suggestion,
+            'auto_fixable': False
+        } for suggestion in validation_result.suggestions]
 
         return suggestions
 
@@ -270,31 +321,32 @@ class WSCValidator:
         }
 
         lines = text.split('\n')
-
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-
-            if not line_stripped:
-                continue
-
-            # Check offset line
-            if i % 2 == 0:  # Even lines should be offsets
-                if not self.wsc_patterns['offset_line'].match(line_stripped):
-                    result['valid'] = False
-                    result['errors'].append({
-                        'line': i + 1,
-                        'message': f"Invalid offset format: {line_stripped[:30]}...",
-                        'suggestion': "Use format <XXXXXXXX:XXXXXXXX>"
-                    })
+        match_offset = self.wsc_patterns['offset_line'].match
+
+        # Only even lines should be offsets; well-formed ones match without
+        # stripping, so only the lines that fail are looked at again
+        offset_lines = lines[0::2]
+        unmatched = [i for i, line in enumerate(offset_lines) if not match_offset(line)]
+        for j in unmatched:
+            line_stripped = offset_lines[j].strip()
+            if line_stripped and not match_offset(line_stripped):
+                result['valid'] = False
+                result['errors'].append({
+                    'line': 2 * j + 1,
+                    'message': f"Invalid offset format: {line_stripped[:30]}...",
+                    'suggestion': "Use format <XXXXXXXX:XXXXXXXX>"
+                })
 
         # Quick content validation
         if result['valid'] and lines:
-            # Check if we have content lines
-            content_lines = [lines[i].strip() for i in range(1, len(lines), 2)]
-            for i, content in enumerate(content_lines):
-                if content:
+            # Check the content lines; ASCII lines always encode
+            for i, line in enumerate(lines[1::2]):
+                if line.isascii():
+                    continue
+                content = line.strip()
+                if content and not content.isascii():
                     try:
-                        content.encode('cp932')
+                        _cp932_encode(content)
                     except UnicodeEncodeError:
                         result['warnings'].append({
                             'line': (i + 1) * 2,
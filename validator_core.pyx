@@ -0,0 +1,31 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# validator_core.pyx
+# Optional compiled core for WSCValidator.validate_offset_consistency.
+# Build in place with:  cythonize -i validator_core.pyx
+# validator.py falls back to checking every adjacent pair in Python when this is not built.
+
+
+def scan_offsets(list entries):
+    """Return the indices i >= 1 where entries[i] does not directly follow entries[i-1].
+
+    An entry directly follows its predecessor when it starts one byte after
+    the previous end and after the previous start; every other pair has an
+    ordering, overlap or gap finding for the caller to report.
+    """
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = len(entries)
+    cdef long long start, prev_start, prev_end
+    cdef list flagged = []
+    if n < 2:
+        return flagged
+    entry = entries[0]
+    prev_start = entry.start_offset
+    prev_end = entry.end_offset
+    for i in range(1, n):
+        entry = entries[i]
+        start = entry.start_offset
+        if start != prev_end + 1 or start <= prev_start:
+            flagged.append(i)
+        prev_start = start
+        prev_end = entry.end_offset
+    return flagged
@@ -2,66 +2,41 @@
 # web_gui.py
 # Web-based GUI for WSC decompiler - works without tkinter
 
+import email.message
+import email.parser
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
+import ipaddress
 import webbrowser
 import json
+import multiprocessing
 import os
+import secrets
+import shutil
 import sys
+import tempfile
 import threading
+import time
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from decompiler import decompile_wsc_file, decode_try
-from recompiler import parse_github_format, recompile_wsc_file, content_to_binary
+from recompiler import WSCEntry, parse_github_format, recompile_wsc_file, reconstruct_wsc_binary_with_status
 from validator import WSCValidator, ValidationResult
 
+try:
+    import orjson  # Optional: faster JSON for the API bodies
+except ImportError:
+    orjson = None
 
-class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        self.settings_file = "settings.json"
-        self.settings = self.load_settings()
-        super().__init__(*args, **kwargs)
-
-    def load_settings(self):
-        """Load settings from file."""
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except:
-            pass
-        return {"output_dir": "", "last_input_dir": ""}
-
-    def save_settings(self):
-        """Save settings to file."""
-        try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2)
-        except:
-            pass
 
-    def do_GET(self):
-        """Handle GET requests."""
-        if self.path == '/':
-            self.serve_main_page()
-        elif self.path.startswith('/api/'):
-            self.handle_api_get()
-        elif self.path.startswith('/download'):
-            self.handle_download()
-        else:
-            super().do_GET()
-
-    def do_POST(self):
-        """Handle POST requests."""
-        if self.path.startswith('/api/'):
-            self.handle_api_post()
-        else:
-            self.send_error(404)
-
-    def serve_main_page(self):
-        """Serve the main HTML page."""
-        html = """
+# Main page, encoded (and gzipped) once at import instead of per request
+_INDEX_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -217,6 +192,8 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                         </div>
                     </div>
 
+                    <div id="liveValidation" style="margin-top: 5px; font-size: 12px; color: #666;"></div>
+
                     <div style="margin-top: 10px;">
                         <h4>ℹ️ File Info</h4>
                         <div id="recompileFileInfo" style="padding: 10px; background: #f5f5f5; border-radius: 4px;">
@@ -249,10 +226,17 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
     <script>
         let selectedFiles = [];
         let currentBrowsePath = '';
+        // The modal lists directories a page at a time, loading more on scroll
+        const BROWSE_PAGE_SIZE = 200;
+        let browseNextOffset = null;
+        let browseLoading = false;
         let selectedDirectory = '';
 
         // Recompiler variables
         let recompilerEntries = [];
+        // Server-side copy of the uploaded entries; validate and compile
+        // send this id instead of the whole list
+        let recompilerSid = null;
         let recompileFilename = '';
         let compiledWSCPath = '';
 
@@ -361,18 +345,47 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         }
 
         function clearLog() {
+            pendingLogLines.delete('log');
             document.getElementById('log').innerHTML = '';
             log('Log cleared');
         }
 
-        function log(message, type = 'info') {
-            const logDiv = document.getElementById('log');
+        // Log lines are queued and appended as nodes once per frame, so a
+        // burst of messages never reparses the whole log's HTML
+        const pendingLogLines = new Map();
+
+        function appendLogLine(logId, message, type) {
             const timestamp = new Date().toLocaleTimeString();
             const className = type === 'error' ? 'error' : type === 'success' ? 'success' : '';
-            logDiv.innerHTML += `<div class="${className}">[${timestamp}] ${message}</div>`;
+            if (!pendingLogLines.has(logId)) {
+                pendingLogLines.set(logId, []);
+                requestAnimationFrame(() => flushLogLines(logId));
+            }
+            pendingLogLines.get(logId).push({ text: `[${timestamp}] ${message}`, className });
+        }
+
+        function flushLogLines(logId) {
+            const lines = pendingLogLines.get(logId);
+            if (!lines) {
+                return;
+            }
+            pendingLogLines.delete(logId);
+            const logDiv = document.getElementById(logId);
+            const fragment = document.createDocumentFragment();
+            for (const { text, className } of lines) {
+                const div = document.createElement('div');
+                div.className = className;
+                div.textContent = text;
+                fragment.appendChild(div);
+            }
+            logDiv.appendChild(fragment);
             logDiv.scrollTop = logDiv.scrollHeight;
         }
 
+        function log(message, type = 'info') {
+            appendLogLine('log', message, type);
+        }
+
         function updateStatus(message) {
             document.getElementById('status').textContent = message;
         }
@@ -399,12 +412,19 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 }
                 formData.append('output_dir', outputDir);
 
-                const response = await fetch('/api/decompile', {
+                const response = await fetch('/api/decompile/stream', {
                     method: 'POST',
                     body: formData
                 });
 
-                const result = await response.json();
+                // Progress arrives as one server-sent event per finished
+                // file; early failures come back as a plain JSON body
+                let result;
+                if ((response.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+                    result = await readDecompileEvents(response);
+                } else {
+                    result = await response.json();
+                }
 
                 if (result.success) {
                     log(`Decompilation complete: ${result.success_count} files processed successfully`, 'success');
@@ -423,6 +443,38 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             }
         }
 
+        async function readDecompileEvents(response) {
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            let summary = { success: false, message: 'Connection closed before the batch finished' };
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffered += decoder.decode(value, { stream: true });
+                let end;
+                while ((end = buffered.indexOf('\\n\\n')) !== -1) {
+                    const event = buffered.slice(0, end);
+                    buffered = buffered.slice(end + 2);
+                    if (!event.startsWith('data: ')) {
+                        continue;
+                    }
+                    const data = JSON.parse(event.slice(6));
+                    if (data.done) {
+                        summary = data;
+                    } else if (data.status === 'ok') {
+                        log(`${data.name}: done in ${data.duration.toFixed(2)}s`, 'info');
+                    } else {
+                        log(`${data.name}: failed - ${data.message}`, 'error');
+                    }
+                }
+            }
+            return summary;
+        }
+
         async function loadSettings() {
             try {
                 const response = await fetch('/api/settings');
@@ -460,34 +512,52 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             await loadDirectory(currentDir);
         }
 
-        async function loadDirectory(path) {
+        async function loadDirectory(path, offset = 0) {
+            browseLoading = true;
             try {
-                const response = await fetch(`/api/browse?path=${encodeURIComponent(path)}`);
+                const response = await fetch(`/api/browse?path=${encodeURIComponent(path)}&offset=${offset}&limit=${BROWSE_PAGE_SIZE}`);
                 const data = await response.json();
 
                 if (data.success) {
                     currentBrowsePath = data.current_path;
-                    displayDirectoryList(data.items);
+                    browseNextOffset = data.has_more ? offset + BROWSE_PAGE_SIZE : null;
+                    displayDirectoryList(data.items, offset > 0);
                     document.getElementById('currentPath').textContent = data.current_path;
                 } else {
                     log(`Error loading directory: ${data.message}`, 'error');
                 }
             } catch (error) {
                 log(`Error loading directory: ${error.message}`, 'error');
+            } finally {
+                browseLoading = false;
             }
         }
 
-        function displayDirectoryList(items) {
+        function displayDirectoryList(items, append = false) {
             const listDiv = document.getElementById('directoryList');
 
-            if (items.length === 0) {
+            if (items.length === 0 && !append) {
                 listDiv.innerHTML = '<div style="padding: 20px; text-align: center; color: #7f8c8d;">No directories found</div>';
                 return;
             }
 
-            listDiv.innerHTML = items.map(item => `<div onclick="selectDirectory('${item.path}')" style="padding: 10px; cursor: pointer; border-bottom: 1px solid #eee; display: flex; align-items: center; gap: 10px;" onmouseover="this.style.background='#f5f5f5'" onmouseout="this.style.background='white'"><span style="font-size: 16px;">${item.type === 'directory' ? '📁' : '📄'}</span><span>${item.name}</span></div>`).join('');
+            const html = items.map(item => `<div onclick="selectDirectory('${item.path}')" style="padding: 10px; cursor: pointer; border-bottom: 1px solid #eee; display: flex; align-items: center; gap: 10px;" onmouseover="this.style.background='#f5f5f5'" onmouseout="this.style.background='white'"><span style="font-size: 16px;">${item.type === 'directory' ? '📁' : '📄'}</span><span>${item.name}</span></div>`).join('');
+            if (append) {
+                listDiv.insertAdjacentHTML('beforeend', html);
+            } else {
+                listDiv.innerHTML = html;
+                listDiv.scrollTop = 0;
+            }
         }
 
+        // Fetch the next page when the list is scrolled near its end
+        document.getElementById('directoryList').addEventListener('scroll', function() {
+            if (browseNextOffset !== null && !browseLoading &&
+                this.scrollTop + this.clientHeight >= this.scrollHeight - 50) {
+                loadDirectory(currentBrowsePath, browseNextOffset);
+            }
+        });
+
         async function selectDirectory(path) {
             selectedDirectory = path;
             await loadDirectory(path);
@@ -584,6 +654,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
 
                 if (data.success) {
                     recompilerEntries = data.entries;
+                    recompilerSid = data.sid;
                     recompileFilename = data.filename.replace('.txt', '.WSC');
 
                     // Log summary first, then details
@@ -607,10 +678,9 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                         }
                     }
 
-                    // Use setTimeout to prevent UI blocking
-                    setTimeout(() => {
+                    // Format in a worker so a large file doesn't block the page
+                    formatEntriesInWorker(data.entries).then(content => {
                         // Display content in editor
-                        const content = formatEntriesAsText(data.entries);
                         const editorElement = document.getElementById('editorContent');
                         editorElement.value = content;
 
@@ -625,7 +695,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
 
                         recompilerLog(`📝 Ready to compile. Editor contains ${content.length} characters.`, 'info');
                         recompilerLog(`💡 Tip: Click "Compile to WSC" when ready to generate your WSC file.`, 'info');
-                    }, 100); // Small delay to prevent blocking
+                    });
 
                 } else {
                     recompilerLog(`❌ Error loading file: ${data.message}`, 'error');
@@ -644,21 +714,68 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             });
         }
 
+        // Two uppercase hex digits per byte value, for hex32
+        const HEX_BYTE = [];
+        for (let i = 0; i < 256; i++) {
+            HEX_BYTE.push(i.toString(16).padStart(2, '0').toUpperCase());
+        }
+
+        function hex32(n) {
+            // Table lookup for the usual 32-bit offsets; anything else
+            // (negative or wider values) keeps the generic formatting
+            if (n >= 0 && n <= 0xFFFFFFFF) {
+                return HEX_BYTE[(n >>> 24) & 255] + HEX_BYTE[(n >>> 16) & 255] +
+                    HEX_BYTE[(n >>> 8) & 255] + HEX_BYTE[n & 255];
+            }
+            return n.toString(16).padStart(8, '0').toUpperCase();
+        }
+
         function formatEntriesAsText(entries) {
-            // Use a more efficient approach for large files
-            const chunks = [];
-            const chunkSize = 100; // Process 100 entries at a time
-
-            for (let i = 0; i < entries.length; i += chunkSize) {
-                const chunk = entries.slice(i, i + chunkSize);
-                const chunkText = chunk.map(entry => {
-                    const speaker_prefix = entry.is_speaker ? '.' : '';
-                    return `<${entry.start_offset.toString(16).padStart(8, '0').toUpperCase()}:${entry.end_offset.toString(16).padStart(8, '0').toUpperCase()}>\\n${speaker_prefix}${entry.content}\\n`;
-                }).join('');
-                chunks.push(chunkText);
+            // One flat string, built by appending; no per-chunk arrays
+            let out = '';
+            for (const entry of entries) {
+                const speaker_prefix = entry.is_speaker ? '.' : '';
+                out += '<' + hex32(entry.start_offset) + ':' + hex32(entry.end_offset) + '>\\n' +
+                    speaker_prefix + entry.content + '\\n';
             }
+            return out;
+        }
 
-            return chunks.join('');
+        // Background formatter built from the two functions above, so the
+        // page needs no separate worker script; replies are matched by id
+        let formatWorker = null;
+        let formatJobId = 0;
+        const formatJobs = new Map();
+
+        function formatEntriesInWorker(entries) {
+            if (typeof Worker === 'undefined') {
+                return Promise.resolve(formatEntriesAsText(entries));
+            }
+            if (!formatWorker) {
+                const source = `const HEX_BYTE = ${JSON.stringify(HEX_BYTE)}; ${hex32} ${formatEntriesAsText} ` +
+                    'onmessage = e => postMessage({ id: e.data.id, text: formatEntriesAsText(e.data.entries) });';
+                try {
+                    formatWorker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+                } catch (error) {
+                    return Promise.resolve(formatEntriesAsText(entries));
+                }
+                formatWorker.onmessage = e => {
+                    formatJobs.get(e.data.id).resolve(e.data.text);
+                    formatJobs.delete(e.data.id);
+                };
+                formatWorker.onerror = () => {
+                    // Finish whatever was pending on the main thread instead
+                    for (const job of formatJobs.values()) {
+                        job.resolve(formatEntriesAsText(job.entries));
+                    }
+                    formatJobs.clear();
+                };
+            }
+            const id = ++formatJobId;
+            return new Promise(resolve => {
+                formatJobs.set(id, { resolve, entries });
+                formatWorker.postMessage({ id, entries });
+            });
         }
 
         function updateRecompileFileInfo(data) {
@@ -681,10 +798,12 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
 
             recompilerLog('Validating content...', 'info');
 
-            const requestData = {
-                content: content,
-                entries: recompilerEntries
-            };
+            const requestData = { content: content };
+            if (recompilerSid) {
+                requestData.sid = recompilerSid;
+            } else {
+                requestData.entries = recompilerEntries;
+            }
 
             fetch('/api/recompile/validate', {
                 method: 'POST',
@@ -705,6 +824,51 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             });
         }
 
+        // Live check while typing: wait for a pause, then send only the
+        // lines around the cursor instead of the whole file and entry list
+        const LIVE_VALIDATE_DELAY = 300;
+        const LIVE_VALIDATE_RADIUS = 40;
+        let liveValidateTimer = null;
+
+        function scheduleLiveValidation() {
+            clearTimeout(liveValidateTimer);
+            liveValidateTimer = setTimeout(liveValidateAroundCursor, LIVE_VALIDATE_DELAY);
+        }
+
+        function liveValidateAroundCursor() {
+            const editor = document.getElementById('editorContent');
+            const lines = editor.value.split('\\n');
+            const cursorLine = editor.value.slice(0, editor.selectionStart).split('\\n').length - 1;
+
+            // Start on an even line so offset lines stay on even positions
+            const lineStart = Math.max(0, cursorLine - LIVE_VALIDATE_RADIUS) & ~1;
+            const lineEnd = Math.min(lines.length, cursorLine + LIVE_VALIDATE_RADIUS + 1);
+
+            fetch('/api/recompile/validate_incremental', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    text: lines.slice(lineStart, lineEnd).join('\\n'),
+                    line_start: lineStart
+                })
+            })
+            .then(response => response.json())
+            .then(data => {
+                const liveDiv = document.getElementById('liveValidation');
+                if (!data.success) {
+                    liveDiv.textContent = `Live check error: ${data.message}`;
+                    return;
+                }
+                const issues = data.quick_validation.errors.concat(data.quick_validation.warnings);
+                liveDiv.textContent = issues.length === 0
+                    ? `✅ Lines ${lineStart + 1}-${lineEnd}: no issues`
+                    : issues.map(issue => `Line ${issue.line}: ${issue.message}`).join(' | ');
+            })
+            .catch(error => {
+                document.getElementById('liveValidation').textContent = `Live check error: ${error.message}`;
+            });
+        }
+
         function displayValidationResults(validationResult, quickValidation) {
             const resultsDiv = document.getElementById('validationResults');
 
@@ -775,11 +939,15 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             }
 
             const requestData = {
-                entries: recompilerEntries,
                 preserve_offsets: preserveOffsets,
                 filename: recompileFilename,
                 output_directory: getCurrentOutputDirectory()
             };
+            if (recompilerSid) {
+                requestData.sid = recompilerSid;
+            } else {
+                requestData.entries = recompilerEntries;
+            }
 
             // Add timeout to prevent hanging
             const controller = new AbortController();
@@ -888,11 +1056,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         }
 
         function recompilerLog(message, type = 'info') {
-            const logDiv = document.getElementById('recompileLog');
-            const timestamp = new Date().toLocaleTimeString();
-            const className = type === 'error' ? 'error' : type === 'success' ? 'success' : '';
-            logDiv.innerHTML += `<div class="${className}">[${timestamp}] ${message}</div>`;
-            logDiv.scrollTop = logDiv.scrollHeight;
+            appendLogLine('recompileLog', message, type);
         }
 
         // Output Directory Management
@@ -1043,20 +1207,503 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         // Initialize on page load
         document.addEventListener('DOMContentLoaded', function() {
             loadOutputDirectory();
+            document.getElementById('editorContent').addEventListener('input', scheduleLiveValidation);
         });
     </script>
 </body>
 </html>
-        """
+        """.encode('utf-8')
+_INDEX_HTML_GZ = gzip.compress(_INDEX_HTML, compresslevel=9, mtime=0)
+# Validators for conditional GETs; the gzip copy is a different representation
+_INDEX_ETAG = '"%s"' % hashlib.blake2b(_INDEX_HTML, digest_size=8).hexdigest()
+_INDEX_ETAG_GZ = _INDEX_ETAG[:-1] + '-gz"'
+
+
+SETTINGS_FILE = "settings.json"
+
+
+def _load_settings_once(settings_file=SETTINGS_FILE):
+    """Load settings from file."""
+    try:
+        if os.path.exists(settings_file):
+            with open(settings_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except:
+        pass
+    return {"output_dir": "", "last_input_dir": ""}
+
+
+# Sorted subdirectory names are reused while the directory's mtime is
+# unchanged, for at most DIR_CACHE_TTL seconds, so paging through a large
+# directory or clicking back and forth reads it only once
+DIR_CACHE_TTL = 5
+
+
+@lru_cache(maxsize=256)
+def _scan_subdirs(path, mtime_ns, ttl_bucket):
+    """Sorted names of path's subdirectories; the extra args only key the cache."""
+    dir_names = []
+    try:
+        # scandir reports the entry type from the directory read itself,
+        # so files cost no extra stat
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        dir_names.append(entry.name)
+                except OSError:
+                    pass
+    except PermissionError:
+        pass
+    dir_names.sort()
+    return tuple(dir_names)
+
+
+def _list_subdirs(path):
+    """Sorted names of path's subdirectories, from the cache when still fresh."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return ()
+    return _scan_subdirs(path, mtime_ns, int(time.monotonic() // DIR_CACHE_TTL))
+
+
+# Worker processes for multi-file decompiles, started on first use and shared
+# by every request: a batch no longer pays process start-up (a fresh
+# interpreter per worker where processes are spawned), and concurrent
+# batches never run more workers than there are cores
+_decompile_pool = None
+_decompile_pool_lock = threading.Lock()
+
+
+def _exit_with_parent():
+    """Pool worker initializer: exit once the server process is gone.
+
+    Forked workers hold copies of the server's pipes and listening socket,
+    so a server killed outright would otherwise leave them idling forever
+    with its port still bound. multiprocessing gives each worker a sentinel
+    for the process that started the pool, whichever start method is used
+    (under forkserver the worker's OS parent is the fork server instead).
+    """
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+
+    def watch():
+        parent.join()
+        os._exit(0)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def _get_decompile_pool():
+    """Return the shared decompile pool, starting it if needed."""
+    global _decompile_pool
+    with _decompile_pool_lock:
+        if _decompile_pool is None:
+            _decompile_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                initializer=_exit_with_parent,
+            )
+        return _decompile_pool
+
+
+def _discard_decompile_pool(pool):
+    """Drop a pool whose worker died so the next batch starts a fresh one."""
+    global _decompile_pool
+    with _decompile_pool_lock:
+        if _decompile_pool is pool:
+            _decompile_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _query_params(url):
+    """Single-valued query parameters of a request path.
+
+    The GET endpoints take a handful of plain parameters, so the first value
+    of each name is kept (as parse_qs()[name][0] did) and a query with more
+    than a few fields is rejected rather than parsed.
+    """
+    params = {}
+    for name, value in urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query, max_num_fields=8):
+        params.setdefault(name, value)
+    return params
+
+
+def _timed_decompile(input_file, output_file):
+    """Run decompile_wsc_file and return how long it took, in seconds."""
+    started = time.perf_counter()
+    decompile_wsc_file(input_file, output_file)
+    return time.perf_counter() - started
+
+
+class _MultipartPart:
+    """One part of a multipart/form-data body, read straight off the stream."""
+
+    def __init__(self, reader, header_text):
+        headers = email.parser.HeaderParser().parsestr(header_text)
+        self._reader = reader
+        self.consumed = False
+        self.name = self._param(headers, 'name')
+        self.filename = self._param(headers, 'filename')
+
+    @staticmethod
+    def _param(headers, key):
+        value = headers.get_param(key, header='content-disposition')
+        if value is None:
+            return None
+        return email.utils.collapse_rfc2231_value(value)
+
+    def iter_chunks(self):
+        """Yield the payload in pieces of at most one read window."""
+        if not self.consumed:
+            self.consumed = True
+            yield from self._reader._payload_chunks()
+
+    def read(self):
+        return b''.join(self.iter_chunks())
+
+    def copy_to(self, f):
+        for chunk in self.iter_chunks():
+            f.write(chunk)
+
+
+class _MultipartReader:
+    """Incremental multipart/form-data parser over a request body stream.
+
+    The body is read in fixed-size windows and delimiters are found with
+    bytearray.find, so memory stays bounded however large the upload is.
+    Iterating yields the parts in order; a part whose payload was not read
+    is skipped before the next one is returned.
+    """
+
+    chunk_size = 1 << 16
+    max_header_size = 1 << 16
+
+    def __init__(self, fp, content_type, content_length):
+        message = email.message.Message()
+        message['Content-Type'] = content_type
+        boundary = message.get_boundary()
+        if not boundary:
+            raise ValueError("Missing multipart boundary")
+        self._fp = fp
+        self._remaining = content_length
+        self._buf = bytearray()
+        self._delimiter = b'--' + boundary.encode('latin-1')
+        self._separator = b'\r\n' + self._delimiter
+
+    def _fill(self):
+        """Read the next window into the buffer; False once the body is used up."""
+        if self._remaining <= 0:
+            return False
+        data = self._fp.read(min(self.chunk_size, self._remaining))
+        if not data:
+            self._remaining = 0
+            return False
+        self._remaining -= len(data)
+        self._buf += data
+        return True
+
+    def _find(self, needle, limit):
+        """Position of needle in the buffer, reading on as needed; -1 if absent."""
+        start = 0
+        while True:
+            index = self._buf.find(needle, start)
+            if index != -1:
+                return index
+            if len(self._buf) > limit:
+                raise ValueError("Malformed multipart body")
+            start = max(0, len(self._buf) - len(needle) + 1)
+            if not self._fill():
+                return -1
+
+    def _payload_chunks(self):
+        # Everything up to the last len(separator) - 1 bytes is safe to hand
+        # out; the tail may be the start of a delimiter split across reads
+        separator = self._separator
+        keep = len(separator) - 1
+        while True:
+            index = self._buf.find(separator)
+            if index != -1:
+                if index:
+                    yield self._buf[:index]
+                del self._buf[:index + len(separator)]
+                return
+            if len(self._buf) > keep:
+                chunk = self._buf[:-keep]
+                del self._buf[:-keep]
+                yield chunk
+            if not self._fill():
+                raise ValueError("Truncated multipart body")
+
+    def __iter__(self):
+        index = self._find(self._delimiter, self.max_header_size)
+        if index == -1:
+            raise ValueError("Malformed multipart body")
+        del self._buf[:index + len(self._delimiter)]
+
+        while True:
+            # After a delimiter, "--" closes the body and CRLF opens a part
+            while len(self._buf) < 2 and self._fill():
+                pass
+            if self._buf[:2] == b'--':
+                break
+            end = self._find(b'\r\n\r\n', self.max_header_size)
+            if end == -1:
+                raise ValueError("Truncated multipart body")
+            header_text = self._buf[:end].decode('utf-8', 'replace').strip()
+            del self._buf[:end + 4]
+
+            part = _MultipartPart(self, header_text)
+            yield part
+            for _ in part.iter_chunks():
+                pass
+
+        # Drain the epilogue so a kept-alive connection starts clean
+        self._buf.clear()
+        while self._fill():
+            self._buf.clear()
+
+
+def _dumps(obj):
+    """Encode an API response body as UTF-8 JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; the stdlib handles those
+    return json.dumps(obj).encode('utf-8')
+
+
+def _loads(body):
+    """Decode a JSON request body from raw bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass  # let the stdlib parser accept it or raise its usual error
+    return json.loads(body.decode('utf-8'))
+
+
+def _intern_strings(obj, cache):
+    """Point every repeated string value in obj's dicts and lists at one copy."""
+    if type(obj) is dict:
+        for key, value in obj.items():
+            if type(value) is str:
+                obj[key] = cache.setdefault(value, value)
+            elif type(value) in (dict, list):
+                _intern_strings(value, cache)
+    elif type(obj) is list:
+        for i, value in enumerate(obj):
+            if type(value) is str:
+                obj[i] = cache.setdefault(value, value)
+            elif type(value) in (dict, list):
+                _intern_strings(value, cache)
+    return obj
+
+
+def _loads_interned(body):
+    """Decode a JSON request body, sharing one object per distinct string.
+
+    Entry lists repeat the same speaker names and commands many times; the
+    per-request cache makes every repeat point at the first copy.
+    """
+    return _intern_strings(_loads(body), {})
+
+
+# Files /download may serve: .wsc files under the default output folder,
+# plus every file compile wrote to a custom output directory. Paths are
+# compared after realpath, so '..' segments and symlinks can't step outside.
+_compiled_files = set()
+_compiled_files_lock = threading.Lock()
+
+
+def _remember_compiled(file_path):
+    """Allow a file compile just wrote to be downloaded."""
+    with _compiled_files_lock:
+        _compiled_files.add(os.path.realpath(file_path))
+
+
+def _downloadable_path(file_path):
+    """Resolved path of a compiled WSC file the client may fetch, or None."""
+    real_path = os.path.realpath(file_path)
+    if not real_path.lower().endswith('.wsc') or not os.path.isfile(real_path):
+        return None
+    output_folder = os.path.realpath(os.path.join(os.getcwd(), "recompiler_output"))
+    if real_path.startswith(output_folder + os.sep):
+        return real_path
+    with _compiled_files_lock:
+        if real_path in _compiled_files:
+            return real_path
+    return None
+
+
+# Entry lists of uploaded files, keyed by a random session id, so validate
+# and compile can refer to them instead of posting the whole list again.
+# Idle sessions expire and only the most recent few are kept.
+SESSION_TTL = 3600
+MAX_SESSIONS = 32
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _store_session(entries_data):
+    """Keep an uploaded entry list and return its new session id."""
+    sid = secrets.token_urlsafe(16)
+    now = time.monotonic()
+    with _sessions_lock:
+        for old_sid, (_, last_used) in list(_sessions.items()):
+            if now - last_used > SESSION_TTL:
+                del _sessions[old_sid]
+        while len(_sessions) >= MAX_SESSIONS:
+            del _sessions[min(_sessions, key=lambda k: _sessions[k][1])]
+        _sessions[sid] = (entries_data, now)
+    return sid
+
+
+def _session_entries(sid):
+    """Return the entry list stored under sid, or None if it has expired."""
+    now = time.monotonic()
+    with _sessions_lock:
+        session = _sessions.get(sid)
+        if session is None or now - session[1] > SESSION_TTL:
+            _sessions.pop(sid, None)
+            return None
+        _sessions[sid] = (session[0], now)
+        return session[0]
+
+
+def _request_entries(data):
+    """Entry dicts for a validate/compile request: posted inline or by session."""
+    if 'entries' in data or 'sid' not in data:
+        return data.get('entries', [])
+    entries_data = _session_entries(data['sid'])
+    if entries_data is None:
+        raise ValueError("session expired, please upload the file again")
+    return entries_data
+
+
+# Responses of recent validate and parse requests, keyed by a digest of the
+# request body. The body holds the editor text (and for validate the entries,
+# or the session id naming them), so unchanged content is answered without
+# parsing or validating again.
+MAX_RESPONSE_CACHE = 16
+_validate_cache = {}
+_parse_cache = {}
+_response_cache_lock = threading.Lock()
+
+
+def _cached_response(cache, key):
+    """Return the response cached under key, or None."""
+    with _response_cache_lock:
+        response = cache.pop(key, None)
+        if response is not None:
+            # Re-insert so the dict stays ordered from least to most recent
+            cache[key] = response
+        return response
+
+
+def _cache_response(cache, key, response):
+    """Remember a response, dropping the least recently used."""
+    with _response_cache_lock:
+        cache.pop(key, None)
+        while len(cache) >= MAX_RESPONSE_CACHE:
+            del cache[next(iter(cache))]
+        cache[key] = response
+
+
+# JSON bodies at least this large are gzipped for clients on another host
+# that accept it. Level 1 shrinks an entry list about tenfold for ~3 ms per
+# MB; over loopback that is time spent for no transfer saved.
+GZIP_MIN_SIZE = 1024
+
+
+class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps the browser's connection open across its API calls;
+    # every response therefore carries a Content-Length. Idle connections
+    # are dropped after the timeout so they don't pin a thread forever.
+    protocol_version = "HTTP/1.1"
+    timeout = 60
+    # Headers and body go out as separate writes; without TCP_NODELAY the
+    # body of a small reply waits on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    # A handler is created per request; settings are loaded once and shared,
+    # with updates serialized under _settings_lock
+    settings_file = SETTINGS_FILE
+    settings = _load_settings_once()
+    _settings_lock = threading.RLock()
+
+    # WSCValidator keeps no per-call state, so every request thread shares one
+    validator = WSCValidator()
+
+    def save_settings(self):
+        """Save settings to file."""
+        with self._settings_lock:
+            try:
+                # Write a sibling temp file and swap it in, so a crash never
+                # leaves a truncated settings.json behind
+                temp_file = f"{self.settings_file}.tmp"
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.settings, f, indent=2)
+                os.replace(temp_file, self.settings_file)
+            except:
+                pass
+
+    def do_GET(self):
+        """Handle GET requests."""
+        if self.path == '/':
+            self.serve_main_page()
+        elif self.path.startswith('/api/'):
+            self.handle_api_get()
+        elif self.path.startswith('/download'):
+            self.handle_download()
+        else:
+            super().do_GET()
+
+    def do_POST(self):
+        """Handle POST requests."""
+        if self.path.startswith('/api/'):
+            self.handle_api_post()
+        else:
+            self.send_error(404)
+
+    def serve_main_page(self):
+        """Serve the main HTML page."""
+        # Precompressed copy for browsers that accept gzip
+        accepts_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        if accepts_gzip:
+            body, etag = _INDEX_HTML_GZ, _INDEX_ETAG_GZ
+        else:
+            body, etag = _INDEX_HTML, _INDEX_ETAG
+
+        # The browser revalidates on every load (no-cache) and gets an
+        # empty 304 while the page is unchanged
+        if etag in (self.headers.get('If-None-Match') or ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
         self.send_response(200)
         self.send_header('Content-type', 'text/html; charset=utf-8')
+        if accepts_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        self.wfile.write(body)
 
     def handle_api_get(self):
         """Handle API GET requests."""
         if self.path == '/api/settings':
-            self.send_json_response(self.settings)
+            with self._settings_lock:
+                settings = dict(self.settings)
+            self.send_json_response(settings)
         elif self.path.startswith('/api/browse'):
             self.handle_directory_browse()
         elif self.path == '/api/recompile/output':
@@ -1068,6 +1715,8 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         """Handle API POST requests."""
         if self.path == '/api/decompile':
             self.handle_decompile()
+        elif self.path == '/api/decompile/stream':
+            self.handle_decompile(stream=True)
         elif self.path == '/api/settings':
             self.handle_settings_update()
         elif self.path.startswith('/api/recompile/'):
@@ -1077,60 +1726,49 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         else:
             self.send_error(404)
 
-    def handle_decompile(self):
-        """Handle file decompilation."""
+    def handle_decompile(self, stream=False):
+        """Handle file decompilation.
+
+        With stream=True the reply is a text/event-stream carrying one event
+        per file as it finishes, then a summary event with done set.
+        """
+        # Uploads go to a private directory per request, so concurrent
+        # batches with the same file names never overwrite each other
+        temp_dir = tempfile.mkdtemp(prefix='wsc_')
         try:
-            import cgi
-            import io
+            self._decompile_batch(temp_dir, stream)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
+    def _decompile_batch(self, temp_dir, stream):
+        streaming = False
+        try:
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
 
-            # Use cgi module for proper multipart parsing
             content_type = self.headers['Content-Type']
             if not content_type.startswith('multipart/form-data'):
                 self.send_json_response({"success": False, "message": "Invalid content type"})
                 return
 
-            # Parse multipart form data properly
-            environ = {
-                'REQUEST_METHOD': 'POST',
-                'CONTENT_TYPE': content_type,
-                'CONTENT_LENGTH': str(content_length)
-            }
-
-            form = cgi.FieldStorage(
-                fp=io.BytesIO(post_data),
-                environ=environ,
-                keep_blank_values=True
-            )
-
             files = []
             output_dir = ""
 
-            # Extract files
-            if 'files' in form:
-                file_field = form['files']
-                if isinstance(file_field, list):
-                    file_items = file_field
-                else:
-                    file_items = [file_field]
-
-                for file_item in file_items:
-                    if file_item.filename:
-                        filename = file_item.filename
-                        file_data = file_item.file.read()
+            # Parse multipart form data straight off the socket, writing each
+            # file part to its temp file as it arrives, so a large batch is
+            # never held in memory
+            for part in _MultipartReader(self.rfile, content_type, content_length):
+                if part.name == 'files' and part.filename:
+                    filename = part.filename
 
-                        if filename.lower().endswith('.wsc'):
-                            # Save file temporarily
-                            temp_path = f"temp_{filename}"
-                            with open(temp_path, 'wb') as f:
-                                f.write(file_data)
-                            files.append(temp_path)
+                    if filename.lower().endswith('.wsc'):
+                        temp_path = os.path.join(temp_dir, os.path.basename(filename))
+                        with open(temp_path, 'wb') as f:
+                            part.copy_to(f)
+                        files.append(temp_path)
 
-            # Extract output directory
-            if 'output_dir' in form:
-                output_dir = form['output_dir'].value.strip()
+                # Extract output directory
+                elif part.name == 'output_dir' and not part.filename:
+                    output_dir = part.read().decode('utf-8', 'replace').strip()
 
             print(f"Files found: {len(files)}")
             print(f"Output directory: '{output_dir}'")
@@ -1150,43 +1788,90 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
-            for temp_file in files:
-                try:
-                    filename = os.path.basename(temp_file)
-                    base_name = filename.replace('temp_', '').replace('.wsc', '')
-                    output_file = os.path.join(output_dir, f"{base_name}.txt")
-
-                    decompile_wsc_file(temp_file, output_file)
+            def output_path(temp_file):
+                filename = os.path.basename(temp_file)
+                base_name = filename.replace('.wsc', '')
+                return os.path.join(output_dir, f"{base_name}.txt")
+
+            def results():
+                """Yield (temp_file, error, duration) as each file finishes."""
+                if len(files) > 1:
+                    # Files are independent and CPU-bound: spread them over
+                    # the shared worker processes
+                    executor = _get_decompile_pool()
+                    futures = {
+                        executor.submit(_timed_decompile, temp_file, output_path(temp_file)): temp_file
+                        for temp_file in files
+                    }
+                    try:
+                        for future in as_completed(futures):
+                            try:
+                                yield futures[future], None, future.result()
+                            except BrokenProcessPool as e:
+                                _discard_decompile_pool(executor)
+                                yield futures[future], e, None
+                            except Exception as e:
+                                yield futures[future], e, None
+                    finally:
+                        # The temp files go away with this request; files a
+                        # dropped stream never reached must not start
+                        for future in futures:
+                            future.cancel()
+                else:
+                    for temp_file in files:
+                        try:
+                            yield temp_file, None, _timed_decompile(temp_file, output_path(temp_file))
+                        except Exception as e:
+                            yield temp_file, e, None
+
+            if stream:
+                # No Content-Length: the event stream ends when the
+                # connection closes
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                streaming = True
+
+            for temp_file, error, duration in results():
+                name = os.path.basename(temp_file)
+                if error is None:
                     success_count += 1
-
-                except Exception as e:
+                    event = {"name": name, "status": "ok", "duration": duration}
+                else:
                     error_count += 1
-                    print(f"Error processing {temp_file}: {e}")
-                finally:
-                    # Clean up temp file
-                    try:
-                        os.unlink(temp_file)
-                    except:
-                        pass
+                    print(f"Error processing {name}: {error}")
+                    event = {"name": name, "status": "error", "message": str(error)}
+                if streaming:
+                    self.send_event(event)
 
-            self.send_json_response({
+            summary = {
                 "success": True,
                 "success_count": success_count,
                 "error_count": error_count
-            })
+            }
+            if streaming:
+                self.send_event(dict(summary, done=True))
+            else:
+                self.send_json_response(summary)
 
         except Exception as e:
-            self.send_json_response({"success": False, "message": str(e)})
+            if streaming:
+                self.send_event({"success": False, "message": str(e), "done": True})
+            else:
+                self.send_json_response({"success": False, "message": str(e)})
 
     def handle_settings_update(self):
         """Handle settings update."""
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            settings = json.loads(post_data.decode('utf-8'))
+            settings = _loads(post_data)
 
-            self.settings.update(settings)
-            self.save_settings()
+            with self._settings_lock:
+                self.settings.update(settings)
+                self.save_settings()
 
             self.send_json_response({"success": True})
 
@@ -1197,10 +1882,14 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         """Handle directory browsing requests."""
         try:
             # Parse path from URL
-            parsed_url = urllib.parse.urlparse(self.path)
-            query_params = urllib.parse.parse_qs(parsed_url.query)
+            query_params = _query_params(self.path)
 
-            path = query_params.get('path', ['/'])[0]
+            path = query_params.get('path', '/')
+            # Optional paging over the sorted directory list; without a
+            # limit every directory is returned in one response
+            offset = max(0, int(query_params.get('offset', '0')))
+            limit = query_params.get('limit')
+            limit = max(1, int(limit)) if limit is not None else None
 
             # Security check - prevent directory traversal
             if '..' in path or not os.path.isabs(path):
@@ -1218,8 +1907,8 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             if os.path.isdir(path):
                 items = []
 
-                # Add parent directory (except for root)
-                if path != '/':
+                # Add parent directory (except for root), on the first page
+                if path != '/' and offset == 0:
                     parent = os.path.dirname(path)
                     items.append({
                         'name': '..',
@@ -1228,23 +1917,19 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                     })
 
                 # Add directory contents
-                try:
-                    for item in sorted(os.listdir(path)):
-                        item_path = os.path.join(path, item)
-                        item_type = 'directory' if os.path.isdir(item_path) else 'file'
+                dir_names = _list_subdirs(path)
 
-                        # Only include directories and common folders
-                        if item_type == 'directory':
-                            items.append({
-                                'name': item,
-                                'path': item_path,
-                                'type': 'directory'
-                            })
-                except PermissionError:
-                    pass
+                end = len(dir_names) if limit is None else offset + limit
+                has_more = end < len(dir_names)
+                for item in dir_names[offset:end]:
+                    items.append({
+                        'name': item,
+                        'path': os.path.join(path, item),
+                        'type': 'directory'
+                    })
 
-                # Add common directories to the root
-                if path == '/':
+                # Add common directories to the root, after the last page
+                if path == '/' and not has_more:
                     common_dirs = ['home', 'Users', 'mnt', 'tmp', 'var']
                     for common_dir in common_dirs:
                         if os.path.exists(f"/{common_dir}"):
@@ -1257,7 +1942,8 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 response_data = {
                     'success': True,
                     'current_path': path,
-                    'items': items
+                    'items': items,
+                    'has_more': has_more
                 }
             else:
                 response_data = {
@@ -1281,6 +1967,8 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             self.handle_recompile_parse()
         elif self.path == '/api/recompile/validate':
             self.handle_recompile_validate()
+        elif self.path == '/api/recompile/validate_incremental':
+            self.handle_recompile_validate_incremental()
         elif self.path == '/api/recompile/compile':
             self.handle_recompile_compile()
         elif self.path == '/api/recompile/output':
@@ -1290,46 +1978,42 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
 
     def handle_recompile_upload(self):
         """Handle file upload for recompiler."""
+        # Private per-request directory, removed however the request ends
+        temp_dir = tempfile.mkdtemp(prefix='wsc_')
         try:
-            import cgi
-            import io
+            self._recompile_upload(temp_dir)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
+    def _recompile_upload(self, temp_dir):
+        try:
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
 
             content_type = self.headers['Content-Type']
             if not content_type.startswith('multipart/form-data'):
                 self.send_json_response({"success": False, "message": "Invalid content type"})
                 return
 
-            environ = {
-                'REQUEST_METHOD': 'POST',
-                'CONTENT_TYPE': content_type,
-                'CONTENT_LENGTH': str(content_length)
-            }
-
-            form = cgi.FieldStorage(
-                fp=io.BytesIO(post_data),
-                environ=environ,
-                keep_blank_values=True
-            )
-
-            if 'file' not in form or not form['file'].filename:
+            # Stream the upload off the socket; only a .txt file part is
+            # written out, straight to its temp file
+            filename = None
+            temp_path = None
+            for part in _MultipartReader(self.rfile, content_type, content_length):
+                if part.name == 'file' and filename is None:
+                    filename = part.filename
+                    if filename and filename.lower().endswith('.txt'):
+                        temp_path = os.path.join(temp_dir, os.path.basename(filename))
+                        with open(temp_path, 'wb') as f:
+                            part.copy_to(f)
+
+            if not filename:
                 self.send_json_response({"success": False, "message": "No file uploaded"})
                 return
 
-            uploaded_file = form['file']
-            filename = uploaded_file.filename
-
-            if not filename.lower().endswith('.txt'):
+            if temp_path is None:
                 self.send_json_response({"success": False, "message": "Please upload a .txt file from decompiler output"})
                 return
 
-            # Save uploaded file temporarily
-            temp_path = f"recompile_temp_{filename}"
-            with open(temp_path, 'wb') as f:
-                f.write(uploaded_file.file.read())
-
             # Read and parse the file with proper encoding handling
             try:
                 with open(temp_path, 'r', encoding='utf-8') as f:
@@ -1368,32 +2052,29 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
 
             # Validate with validator
             try:
-                validator = WSCValidator()
+                validator = self.validator
                 validation_result = validator.comprehensive_validation(content, entries)
             except Exception as validation_error:
                 # If validation fails due to encoding issues, still return the parsed entries
                 validation_result = ValidationResult()
                 validation_result.add_warning(f"Validation error (but parsing succeeded): {str(validation_error)}")
 
-            # Clean up temp file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            entries_data = [
+                {
+                    "start_offset": entry.start_offset,
+                    "end_offset": entry.end_offset,
+                    "content": entry.content,
+                    "is_speaker": entry.is_speaker,
+                    "original_length": entry.original_length
+                }
+                for entry in entries
+            ]
 
             response = {
                 "success": True,
                 "filename": filename,
-                "entries": [
-                    {
-                        "start_offset": entry.start_offset,
-                        "end_offset": entry.end_offset,
-                        "content": entry.content,
-                        "is_speaker": entry.is_speaker,
-                        "original_length": entry.original_length
-                    }
-                    for entry in entries
-                ],
+                "sid": _store_session(entries_data),
+                "entries": entries_data,
                 "parse_result": {
                     "valid": parse_result.is_valid,
                     "errors": parse_result.errors,
@@ -1420,7 +2101,13 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            cache_key = hashlib.blake2b(post_data, digest_size=16).digest()
+            response = _cached_response(_parse_cache, cache_key)
+            if response is not None:
+                self.send_json_response(response)
+                return
+
+            data = _loads(post_data)
 
             content = data.get('content', '')
             if not content:
@@ -1450,6 +2137,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 }
             }
 
+            _cache_response(_parse_cache, cache_key, response)
             self.send_json_response(response)
 
         except Exception as e:
@@ -1460,13 +2148,18 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            cache_key = hashlib.blake2b(post_data, digest_size=16).digest()
+            response = _cached_response(_validate_cache, cache_key)
+            if response is not None:
+                self.send_json_response(response)
+                return
+
+            data = _loads_interned(post_data)
 
             content = data.get('content', '')
-            entries_data = data.get('entries', [])
+            entries_data = _request_entries(data)
 
             # Convert back to WSCEntry objects
-            from recompiler import WSCEntry
             entries = []
             for entry_data in entries_data:
                 entry = WSCEntry(
@@ -1478,7 +2171,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 entries.append(entry)
 
             # Validate
-            validator = WSCValidator()
+            validator = self.validator
             validation_result = validator.comprehensive_validation(content, entries)
 
             # Quick validation for real-time feedback
@@ -1497,25 +2190,56 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 "repair_suggestions": validator.generate_repair_suggestions(validation_result)
             }
 
+            _cache_response(_validate_cache, cache_key, response)
             self.send_json_response(response)
 
         except Exception as e:
             self.send_json_response({"success": False, "message": f"Validation error: {str(e)}"})
 
+    def handle_recompile_validate_incremental(self):
+        """Handle live validation of the editor lines around the cursor.
+
+        The client sends only a window of lines starting at an even line
+        (an offset line), so quick_validate runs over that slice and the
+        reported line numbers are shifted back to editor positions.
+        """
+        try:
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            data = _loads(post_data)
+
+            text = data.get('text', '')
+            line_start = int(data.get('line_start', 0))
+            if line_start < 0 or line_start % 2:
+                self.send_json_response({"success": False, "message": "line_start must be a non-negative even line"})
+                return
+
+            quick_result = self.validator.quick_validate(text)
+            for issue in quick_result['errors'] + quick_result['warnings']:
+                issue['line'] += line_start
+
+            self.send_json_response({
+                "success": True,
+                "line_start": line_start,
+                "quick_validation": quick_result
+            })
+
+        except Exception as e:
+            self.send_json_response({"success": False, "message": f"Validation error: {str(e)}"})
+
     def handle_recompile_compile(self):
         """Handle compilation request back to WSC format."""
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            data = _loads_interned(post_data)
 
-            entries_data = data.get('entries', [])
+            entries_data = _request_entries(data)
             preserve_offsets = data.get('preserve_offsets', True)
             filename = data.get('filename', 'recompiled.wsc')
             custom_output_dir = data.get('output_directory', '')
 
             # Convert back to WSCEntry objects
-            from recompiler import WSCEntry
             entries = []
             for entry_data in entries_data:
                 entry = WSCEntry(
@@ -1526,9 +2250,8 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 )
                 entries.append(entry)
 
-            # Reconstruct binary
-            from recompiler import reconstruct_wsc_binary
-            binary_data = reconstruct_wsc_binary(entries, preserve_offsets)
+            # Reconstruct binary; the flag says whether the original offsets held
+            binary_data, offsets_preserved = reconstruct_wsc_binary_with_status(entries, preserve_offsets)
 
             # Use custom output directory or default
             if custom_output_dir:
@@ -1557,6 +2280,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
             # Save compiled WSC file to output folder
             with open(output_path, 'wb') as f:
                 f.write(binary_data)
+            _remember_compiled(output_path)
 
             # Get file info
             file_size = len(binary_data)
@@ -1571,10 +2295,7 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
                 "output_folder": output_folder,
                 "entries_count": len(entries),
                 "preserve_offsets": preserve_offsets,
-                "offsets_recalculated": not preserve_offsets or not all(
-                    len(content_to_binary(e.content, e.is_speaker)) == e.original_length + 1
-                    for e in entries
-                )
+                "offsets_recalculated": not offsets_preserved
             }
 
             self.send_json_response(response)
@@ -1634,70 +2355,98 @@ class WSCWebHandler(http.server.SimpleHTTPRequestHandler):
         """Handle file download requests."""
         try:
             # Parse the file parameter from URL
-            parsed_url = urllib.parse.urlparse(self.path)
-            query_params = urllib.parse.parse_qs(parsed_url.query)
+            query_params = _query_params(self.path)
 
             if 'file' not in query_params:
                 self.send_error(400, "Missing file parameter")
                 return
 
-            file_path = query_params['file'][0]
+            file_path = query_params['file']
 
             # Security check - prevent directory traversal
             if '..' in file_path:
                 self.send_error(400, "Invalid file path")
                 return
 
-            # Allow files from recompiler_output folder - handle both WSL paths
-            output_folder = os.path.join(os.getcwd(), "recompiler_output")
-
-            # Check if the file exists and has valid WSC extension
-            file_exists = os.path.exists(file_path)
-            has_valid_extension = file_path.endswith('.wsc') or file_path.endswith('.WSC')
-
-            # Check multiple valid output folder paths (WSL compatibility)
-            abs_file_path = os.path.abspath(file_path)
-            is_valid_output_file = (
-                has_valid_extension and file_exists and (
-                    abs_file_path.startswith(output_folder) or  # Current working directory
-                    abs_file_path.endswith('/recompiler_output/' + os.path.basename(file_path)) or  # Any recompiler_output folder
-                    ('recompiler_output' in abs_file_path and has_valid_extension)  # Contains recompiler_output path
-                )
-            )
-            is_valid_temp_file = file_path.startswith('recompile_output_')
-
-          if not file_exists or not (is_valid_output_file or is_valid_temp_file):
+            # Only compiled WSC files: see _downloadable_path
+            real_path = _downloadable_path(file_path)
+            if real_path is None:
                 self.send_error(404, "File not found")
                 return
 
-            # Send file
+            # The kernel copies the file to the socket with sendfile(2);
+            # socket.sendfile falls back to a chunked send loop elsewhere
             filename = os.path.basename(file_path)
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
+            with open(real_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
 
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/octet-stream')
-            self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
-            self.send_header('Content-Length', str(len(file_data)))
-            self.end_headers()
-            self.wfile.write(file_data)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+                self.send_header('Content-Length', str(file_size))
+                self.end_headers()
+                self.wfile.flush()
+                self.connection.sendfile(f)
 
         except Exception as e:
             self.send_error(500, f"Download error: {str(e)}")
 
+    def send_event(self, data):
+        """Write one server-sent event carrying data as JSON."""
+        self.wfile.write(b'data: ' + _dumps(data) + b'\n\n')
+        self.wfile.flush()
+
+    def _is_remote_client(self):
+        """True unless the request came in over loopback."""
+        try:
+            addr = ipaddress.ip_address(self.client_address[0])
+        except ValueError:
+            return True
+        if addr.version == 6 and addr.ipv4_mapped:
+            addr = addr.ipv4_mapped
+        return not addr.is_loopback
+
     def send_json_response(self, data):
         """Send JSON response."""
+        body = _dumps(data)
+        compress = (
+            len(body) >= GZIP_MIN_SIZE
+            and 'gzip' in (self.headers.get('Accept-Encoding') or '')
+            and self._is_remote_client()
+        )
+        if compress:
+            body = gzip.compress(body, compresslevel=1, mtime=0)
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        # A failed POST may have stopped before reading its whole body; close
+        # rather than parse the leftover bytes as the next request
+        if self.command == 'POST' and not data.get('success', True):
+            self.send_header('Connection', 'close')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
+
+
+class WSCWebServer(http.server.ThreadingHTTPServer):
+    """One daemon thread per connection, with a deeper accept backlog.
+
+    The page fires several requests at once on load and during batches;
+    the default backlog of 5 can make the kernel drop extra SYNs.
+    """
+
+    request_queue_size = 128
 
 
 def start_web_server(port=8080):
     """Start the web server."""
     handler = WSCWebHandler
 
-    with socketserver.TCPServer(("", port), handler) as httpd:
+    # One daemon thread per connection, so a long decompile or compile
+    # request no longer blocks every other client
+    with WSCWebServer(("", port), handler) as httpd:
         print(f"🌐 WSC Decompiler Web GUI started at http://localhost:{port}")
         print("Press Ctrl+C to stop the server")
         print()
@@ -1710,7 +2459,6 @@ def start_web_server(port=8080):
 
         # Open browser automatically
         def open_browser():
-            import time
             time.sleep(1)  # Give server time to start
             webbrowser.open(f'http://localhost:{port}')
 